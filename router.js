@@ -6,19 +6,40 @@ class Router {
     this.teamsData = null;
     this.tournamentsData = null;
     this.matchesData = null;
+    this.bundleManifest = null;
+  }
+
+  // Hashed bundle paths from data/bundles/manifest.json (written by
+  // generate_match_pages.py --bundles), or {} when there are none
+  loadBundleManifest() {
+    if (!this.bundleManifest) {
+      this.bundleManifest = fetch('/data/bundles/manifest.json')
+        .then(r => (r.ok ? r.json() : {}))
+        .catch(() => ({}));
+    }
+    return this.bundleManifest;
+  }
+
+  // One dataset (teams, tournaments, canais): from its long-cached bundle
+  // when there is one, else from data/<name>.json
+  async loadDataset(name) {
+    const bundles = await this.loadBundleManifest();
+    const url = bundles[name] || `/data/${name}.json`;
+    const data = await fetch(url).then(r => r.json());
+    return data[name];
   }
 
   // Load all data files
   async loadData() {
     try {
       const [teams, tournaments, matches] = await Promise.all([
-        fetch('/data/teams.json').then(r => r.json()),
-        fetch('/data/tournaments.json').then(r => r.json()),
+        this.loadDataset('teams'),
+        this.loadDataset('tournaments'),
         fetch('/data/matches.json').then(r => r.json())
       ]);
 
-      this.teamsData = teams.teams;
-      this.tournamentsData = tournaments.tournaments;
+      this.teamsData = teams;
+      this.tournamentsData = tournaments;
       this.matchesData = matches.matches;
 
       return true;
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Firestore upload throughput against the local emulator
+Uploads data/matches.json (repeated --copies times under new ids) with
+the old one-set()-per-document loop, with write batches committed one at
+a time and with batches committed in parallel, and reports docs/sec.
+
+Start the emulator first and point the SDK at it:
+    firebase emulators:start --only firestore
+    export FIRESTORE_EMULATOR_HOST=localhost:8080
+
+Usage:
+    python spiders/bench_firestore_upload.py [--copies 10] [--workers 4]
+"""
+
+import argparse
+import json
+import time
+
+from firebase_client import emulator_host, get_db
+from firestore_writes import write_in_batches
+from upload_json_to_firestore import BASE_DIR, upload_collection
+
+
+def emulator_client():
+    """Firestore client for the emulator (never the production project)"""
+    if not emulator_host():
+        raise SystemExit("FIRESTORE_EMULATOR_HOST is not set: start the Firestore emulator first")
+    return get_db()
+
+
+def load_items(copies):
+    with open(BASE_DIR / 'data' / 'matches.json', 'r', encoding='utf-8') as f:
+        matches = json.load(f)['matches']
+    items = []
+    for copy in range(copies):
+        for match in matches:
+            item = dict(match)
+            item['id'] = f"{match['id']}-{copy}"
+            items.append(item)
+    return items
+
+
+def upload_serial(db, collection_name, items):
+    """The previous behaviour: one blocking set() per document"""
+    for item in items:
+        db.collection(collection_name).document(item['id']).set(item)
+    return len(items)
+
+
+def clear_collection(db, collection_name):
+    writes = (('delete', doc.reference, None) for doc in db.collection(collection_name).select([]).stream())
+    write_in_batches(db, writes, workers=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Firestore uploads on the emulator")
+    parser.add_argument('--copies', type=int, default=10, help="Copies of matches.json to upload (default: 10)")
+    parser.add_argument('--workers', type=int, default=4, help="Parallel batches for the last run (default: 4)")
+    args = parser.parse_args()
+
+    db = emulator_client()
+    items = load_items(args.copies)
+
+    runs = [
+        ('one set() per document', lambda name: upload_serial(db, name, items)),
+        ('batches, 1 at a time', lambda name: upload_collection(db, name, items, workers=1)),
+        (f'batches, {args.workers} in parallel', lambda name: upload_collection(db, name, items, workers=args.workers)),
+    ]
+
+    results = []
+    for index, (label, run) in enumerate(runs):
+        collection_name = f"bench_matches_{index}"
+        clear_collection(db, collection_name)
+        start = time.perf_counter()
+        written = run(collection_name)
+        elapsed = time.perf_counter() - start
+        clear_collection(db, collection_name)
+        results.append((label, written, elapsed))
+
+    print()
+    print(f"Documents per run: {len(items)}")
+    for label, written, elapsed in results:
+        print(f"{label:<28} {written:>6} docs in {elapsed:6.2f} s  ({written / elapsed:8.1f} docs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: resultados round page parsing throughput
+Compares the full-tree BeautifulSoup parse with the table-only parse used
+by the scraper, over the round pages saved in the HTTP cache (.http_cache/,
+filled by any scrape_resultados.py run). Both paths must return identical
+matches before they are timed.
+
+Usage:
+    python spiders/bench_parse_resultados.py [--rounds 3]
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from http_cache import CACHE_DIR
+from resultados_scraper.parser import parse_html_content
+
+
+def load_cached_pages(cache_dir=CACHE_DIR):
+    """(url, html) for every cached resultados-futbol round page"""
+    pages = []
+    for meta_path in sorted(cache_dir.glob('*.json')):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            url = json.load(f).get('url', '')
+        if '/competicion/' not in url:
+            continue
+        with gzip.open(meta_path.with_suffix('.gz'), 'rb') as f:
+            pages.append((url, f.read().decode('utf-8', errors='replace')))
+    return pages
+
+
+def pages_per_second(pages, rounds, full_tree):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for url, html in pages:
+            parse_html_content(html, url, full_tree=full_tree)
+    return rounds * len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resultados round page parsing")
+    parser.add_argument('--rounds', type=int, default=3, help="Passes over all pages (default: 3)")
+    args = parser.parse_args()
+
+    pages = load_cached_pages()
+    if not pages:
+        raise SystemExit(f"No cached round pages in {CACHE_DIR}, run scrape_resultados.py first")
+
+    # Both paths must produce the same matches before timing means anything
+    for url, html in pages:
+        if parse_html_content(html, url, full_tree=True) != parse_html_content(html, url):
+            raise SystemExit(f"ERROR: table-only parse differs from full parse for {url}")
+
+    before = pages_per_second(pages, args.rounds, full_tree=True)
+    after = pages_per_second(pages, args.rounds, full_tree=False)
+
+    print(f"Pages: {len(pages)}, rounds: {args.rounds}")
+    print(f"Full tree:   {before:.1f} pages/s")
+    print(f"Tables only: {after:.1f} pages/s")
+    print(f"Speedup:     {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark: per-page render time of match pages
+Compares the old per-match replace/regex surgery on the raw match.html with
+the precompiled template used by generate_match_pages.py, using the bundled
+data/*.json files (no Firestore needed).
+
+Usage:
+    python spiders/bench_render_match_pages.py [--rounds 20]
+"""
+
+import argparse
+import json
+import time
+
+from generate_match_pages import (
+    BASE_DIR, DATA_DIR, PAGE_PREFIX, apply_template_surgery, build_static_data_js,
+    compile_match_template, page_texts, render_match_page,
+)
+
+
+def load_json_records(name, key):
+    with open(DATA_DIR / f"{name}.json", 'r', encoding='utf-8') as f:
+        return json.load(f)[key]
+
+
+def build_inputs():
+    """One (static_data_js, home, away, tournament) tuple per bundled match"""
+    matches = load_json_records('matches', 'matches')
+    teams = {t['id']: t for t in load_json_records('teams', 'teams')}
+    tournaments = {t['id']: t for t in load_json_records('tournaments', 'tournaments')}
+    canais = load_json_records('canais', 'canais')
+
+    inputs = []
+    for match in matches:
+        home_name = teams.get(match['homeTeam'], {}).get('name', match['homeTeam'])
+        away_name = teams.get(match['awayTeam'], {}).get('name', match['awayTeam'])
+        tournament_name = tournaments.get(match['tournament'], {}).get('name', match['tournament'])
+        static_data_js = build_static_data_js(match, list(teams.values()), list(tournaments.values()), canais)
+        inputs.append((static_data_js, home_name, away_name, tournament_name))
+    return inputs
+
+
+def render_raw(template, static_data_js, home_name, away_name, tournament_name):
+    title_text, description_text = page_texts(home_name, away_name, tournament_name)
+    return apply_template_surgery(template, static_data_js, title_text, description_text, PAGE_PREFIX)
+
+
+def time_per_page(render, inputs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for args in inputs:
+            render(*args)
+    return (time.perf_counter() - start) / (rounds * len(inputs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark match page rendering")
+    parser.add_argument('--rounds', type=int, default=20, help="Passes over all matches (default: 20)")
+    args = parser.parse_args()
+
+    with open(BASE_DIR / 'match.html', 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    inputs = build_inputs()
+
+    start = time.perf_counter()
+    compiled = compile_match_template(template)
+    compile_time = time.perf_counter() - start
+
+    # Both paths must produce the same bytes before timing means anything
+    for args_ in inputs:
+        if render_raw(template, *args_) != render_match_page(compiled, *args_):
+            raise SystemExit("ERROR: compiled output differs from raw template surgery")
+
+    before = time_per_page(lambda *a: render_raw(template, *a), inputs, args.rounds)
+    after = time_per_page(lambda *a: render_match_page(compiled, *a), inputs, args.rounds)
+
+    print(f"Matches: {len(inputs)}, rounds: {args.rounds}")
+    print(f"Template compile (once): {compile_time * 1e6:.1f} us")
+    print(f"Raw surgery per page:    {before * 1e6:.1f} us")
+    print(f"Compiled per page:       {after * 1e6:.1f} us")
+    print(f"Speedup:                 {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+Recorded-fixture benchmark and regression suite for the scrapers
+Records real responses once into versioned fixtures, then replays them
+through a local HTTP stand-in (fixture_server.py) to check, per scraper:
+output equality with the recorded expectations, pages/sec, bytes served
+per page and peak memory.
+
+Scrapers covered:
+    resultados  resultados_scraper fetch_and_parse (one case set per competition)
+    league      generate_team_pages.extract_teams_from_league
+    team        scrape_team_details.scrape_team_details
+    team-api    scrape_team_details.scrape_api_jobs (the same teams, one API query)
+
+Usage:
+    python spiders/bench_scrapers.py record [--rounds 1,2] [--teams-per-league 2]
+    python spiders/bench_scrapers.py synthesize [--rounds 1,2] [--teams-per-league 2]
+    python spiders/bench_scrapers.py replay [--passes 5]
+    python spiders/bench_scrapers.py replay --update   # accept current output
+
+Fixtures live in spiders/fixtures/scrapers/ and are committed. The
+committed set is synthetic (built offline from data/matches.json and
+data/teams.json in the sites' page layouts; the manifest says which);
+recording from a machine with network access replaces it with real
+pages. Re-record when the sites change (bump FIXTURE_VERSION if the
+layout does).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+from fixture_server import MediaWikiStandIn, url_key
+from site_fixtures import league_pages, load_data, round_page, team_article
+from resultados_scraper import COMPETITIONS, round_url
+from resultados_scraper.engine import fetch_and_parse, parse_rounds
+from resultados_scraper.fetcher import HEADERS, AsyncFetcher
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'scrapers'
+MANIFEST_FILE = FIXTURES_DIR / 'manifest.json'
+FIXTURE_VERSION = 1
+
+
+def team_scrapers():
+    """The Wikipedia scraper modules, with their HTTP cache switched off"""
+    import generate_team_pages
+    import scrape_team_details
+    generate_team_pages.http_cache.enabled = False
+    scrape_team_details.http_cache.enabled = False
+    return generate_team_pages, scrape_team_details
+
+
+def run_case(case, url):
+    """Run the case's scraper against url and return its output"""
+    if case['scraper'] == 'resultados':
+        return fetch_and_parse(url, competition=COMPETITIONS[case['competition']])
+    generate_team_pages, scrape_team_details = team_scrapers()
+    if case['scraper'] == 'team-api':
+        return run_api_case(scrape_team_details, case, url)
+    if case['scraper'] == 'league':
+        return generate_team_pages.extract_teams_from_league(url, case['league'])
+    result = scrape_team_details.scrape_team_details(url, case['team'])
+    if result:
+        # The page URL is echoed back; keep the recorded one, not the stand-in's
+        result['wiki_url'] = case['url']
+    return result
+
+
+def run_api_case(scrape_team_details, case, url):
+    """{recorded wiki_url: team_data} for the case's teams, queried from the
+    stand-in at url's host"""
+    base_url = url.split('/wiki/', 1)[0]
+    jobs = [{'slug': team['url'], 'name': team['team'], 'wiki_url': base_url + url_key(team['url'])}
+            for team in case['teams']]
+    results = {}
+
+    def on_result(job, team_data, error):
+        if team_data:
+            team_data['wiki_url'] = job['slug']
+        results[job['slug']] = team_data
+
+    asyncio.run(scrape_team_details.scrape_api_jobs(jobs, on_result, rate=0))
+    return results
+
+
+def case_pages(case):
+    """Pages (teams, for an API case) a case's scraper produces"""
+    return len(case['teams']) if case['scraper'] == 'team-api' else 1
+
+
+def stand_in(cases):
+    """Stand-in serving the recorded pages and the recorded API articles"""
+    articles = {}
+    responses = {}
+    for case in cases:
+        if case['scraper'] == 'team-api':
+            articles.update(json.loads(case['body']))
+        else:
+            responses[case['url']] = (case['contentType'], case['body'])
+    return MediaWikiStandIn(articles, responses)
+
+
+def quiet(func, *args):
+    """Call func with the scrapers' progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+# =============================================================================
+# Fixture files
+# =============================================================================
+
+def case_paths(name):
+    return FIXTURES_DIR / 'cases' / f"{name}.json", FIXTURES_DIR / 'cases' / f"{name}.html.gz"
+
+
+def load_cases():
+    if not MANIFEST_FILE.exists():
+        raise SystemExit(f"No fixtures at {FIXTURES_DIR}, run: python spiders/bench_scrapers.py record")
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != FIXTURE_VERSION:
+        raise SystemExit(f"Fixtures are version {manifest.get('version')}, expected {FIXTURE_VERSION}: re-record")
+
+    cases = []
+    for name in manifest['cases']:
+        case_path, body_path = case_paths(name)
+        with open(case_path, 'r', encoding='utf-8') as f:
+            case = json.load(f)
+        with gzip.open(body_path, 'rb') as f:
+            case['body'] = f.read()
+        cases.append(case)
+    return cases
+
+
+def save_case(case):
+    case_path, body_path = case_paths(case['name'])
+    case_path.parent.mkdir(parents=True, exist_ok=True)
+    stored = {key: value for key, value in case.items() if key != 'body'}
+    with open(case_path, 'w', encoding='utf-8') as f:
+        json.dump(stored, f, ensure_ascii=False, indent=2)
+    # mtime=0 keeps re-recorded bodies byte-identical when the page did not change
+    with open(body_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        f.write(case['body'])
+
+
+def save_manifest(cases, source='recorded'):
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        'version': FIXTURE_VERSION,
+        'source': source,
+        'recordedAt': datetime.now(timezone.utc).isoformat(),
+        'cases': [case['name'] for case in cases],
+    }
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def fill_expected(cases):
+    """Set each case's expected output by running it against the stand-in"""
+    with stand_in(cases) as server:
+        for case in cases:
+            case['expected'] = quiet(run_case, case, server.url(case['url']))
+
+
+# =============================================================================
+# Record
+# =============================================================================
+
+def download(session, url):
+    response = session.get(url, timeout=30)
+    response.raise_for_status()
+    return response.headers.get('Content-Type', 'text/html; charset=utf-8'), response.content
+
+
+def download_articles(scrape_team_details, teams, delay):
+    """{title: {'wikitext', 'extract'}} for the teams' articles, from the live API"""
+    fetcher = AsyncFetcher(concurrency=1, rate=1 / delay if delay else 0)
+    articles = {}
+    for batch in scrape_team_details.api_batches([{'wiki_url': team['url']} for team in teams]):
+        urls = [job['wiki_url'] for job in batch]
+        pages = asyncio.run(scrape_team_details.fetch_api_pages(fetcher, urls))
+        for wiki_url, page in pages.items():
+            if page:
+                revisions = page.get('revisions') or [{}]
+                articles[scrape_team_details.wiki_title(wiki_url)] = {
+                    'wikitext': revisions[0].get('slots', {}).get('main', {}).get('content', ''),
+                    'extract': page.get('extract', ''),
+                }
+    return articles
+
+
+def record(rounds, teams_per_league, delay):
+    generate_team_pages, scrape_team_details = team_scrapers()
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    cases = []
+
+    def add(case):
+        print(f"Recording {case['name']}: {case['url']}")
+        case['contentType'], case['body'] = download(session, case['url'])
+        cases.append(case)
+        time.sleep(delay)
+
+    for name, competition in COMPETITIONS.items():
+        first_round, last_round = competition['rounds']
+        for round_number in rounds:
+            if first_round <= round_number <= last_round:
+                add({'name': f"resultados-{name}-{round_number}", 'scraper': 'resultados',
+                     'competition': name, 'url': round_url(competition, round_number)})
+
+    for league, league_url in generate_team_pages.CAMPEONATOS.items():
+        add({'name': f"league-{league}", 'scraper': 'league', 'league': league, 'url': league_url})
+
+    # A few team pages linked from each recorded league page
+    fill_expected(cases)
+    seen = set()
+    for case in [case for case in cases if case['scraper'] == 'league']:
+        teams = list(case['expected'].values())[:teams_per_league]
+        for team in teams:
+            if team['wiki_url'] in seen:
+                continue
+            seen.add(team['wiki_url'])
+            slug = generate_team_pages.slugify(team['name'])
+            add({'name': f"team-{slug}", 'scraper': 'team', 'team': team['name'], 'url': team['wiki_url']})
+
+    # The same teams through the MediaWiki API
+    teams = [{'team': case['team'], 'url': case['url']} for case in cases if case['scraper'] == 'team']
+    if teams:
+        print(f"Recording team-api: {len(teams)} articles")
+        articles = download_articles(scrape_team_details, teams, delay)
+        cases.append({'name': 'team-api', 'scraper': 'team-api', 'url': teams[0]['url'], 'teams': teams,
+                      'contentType': 'application/json',
+                      'body': json.dumps(articles, ensure_ascii=False, sort_keys=True).encode('utf-8')})
+
+    fill_expected(cases)
+    for case in cases:
+        save_case(case)
+    save_manifest(cases)
+    print(f"Recorded {len(cases)} pages into {FIXTURES_DIR}")
+
+
+# =============================================================================
+# Synthesize
+# =============================================================================
+# The recorded cases, with site_fixtures.py pages instead of live ones.
+
+ROUND_NUMBER = re.compile(r'^(\d+)ª Rodada$')
+
+
+def synthesize(rounds, teams_per_league):
+    generate_team_pages, scrape_team_details = team_scrapers()
+    matches = load_data('matches.json', 'matches')
+    teams = load_data('teams.json', 'teams')
+    cases = []
+
+    for name, competition in COMPETITIONS.items():
+        for round_number in rounds:
+            round_matches = []
+            for match in matches:
+                number = ROUND_NUMBER.match(match.get('round', ''))
+                if (match.get('tournament') == competition['tournament'] and match.get('matchDate')
+                        and number and int(number.group(1)) == round_number):
+                    round_matches.append(match)
+            if round_matches:
+                cases.append({'name': f"resultados-{name}-{round_number}", 'scraper': 'resultados',
+                              'competition': name, 'url': round_url(competition, round_number),
+                              'contentType': 'text/html; charset=utf-8',
+                              'body': round_page(round_matches).encode('utf-8')})
+
+    pages = league_pages(generate_team_pages.CAMPEONATOS)
+    for league, league_url in generate_team_pages.CAMPEONATOS.items():
+        content_type, body = pages[league_url]
+        cases.append({'name': f"league-{league}", 'scraper': 'league', 'league': league, 'url': league_url,
+                      'contentType': content_type, 'body': body})
+
+    # A few teams of each league page, picked as record() does
+    fill_expected(cases)
+    by_name = {team['name']: team for team in teams}
+    articles = {}
+    api_teams = []
+    for case in [case for case in cases if case['scraper'] == 'league']:
+        for team in list(case['expected'].values())[:teams_per_league]:
+            title = scrape_team_details.wiki_title(team['wiki_url'])
+            if title in articles or team['name'] not in by_name:
+                continue
+            html, articles[title] = team_article(by_name[team['name']])
+            slug = generate_team_pages.slugify(team['name'])
+            cases.append({'name': f"team-{slug}", 'scraper': 'team', 'team': team['name'], 'url': team['wiki_url'],
+                          'contentType': 'text/html; charset=utf-8', 'body': html.encode('utf-8')})
+            api_teams.append({'team': team['name'], 'url': team['wiki_url']})
+
+    if api_teams:
+        cases.append({'name': 'team-api', 'scraper': 'team-api', 'url': api_teams[0]['url'], 'teams': api_teams,
+                      'contentType': 'application/json',
+                      'body': json.dumps(articles, ensure_ascii=False, sort_keys=True).encode('utf-8')})
+
+    fill_expected(cases)
+    for case in cases:
+        save_case(case)
+    save_manifest(cases, source='synthetic')
+    print(f"Synthesized {len(cases)} pages into {FIXTURES_DIR}")
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+def replay(passes, update=False):
+    cases = load_cases()
+    failures = []
+
+    with stand_in(cases) as server:
+        # Output equality
+        for case in cases:
+            output = quiet(run_case, case, server.url(case['url']))
+            if output != case['expected']:
+                failures.append(case['name'])
+                if update:
+                    case['expected'] = output
+                    save_case(case)
+
+        # Throughput and peak memory per scraper
+        print(f"{'scraper':<24} {'pages':>5} {'pages/s':>9} {'KB/page':>8} {'peak MB':>8}")
+        groups = {}
+        for case in cases:
+            key = case['scraper'] if case['scraper'] != 'resultados' else f"resultados/{case['competition']}"
+            groups.setdefault(key, []).append(case)
+
+        for key, group in groups.items():
+            pages = sum(case_pages(case) for case in group)
+            sent = server.bytes_sent
+            start = time.perf_counter()
+            for _ in range(passes):
+                for case in group:
+                    quiet(run_case, case, server.url(case['url']))
+            pages_per_second = passes * pages / (time.perf_counter() - start)
+            kb_per_page = (server.bytes_sent - sent) / (passes * pages) / 1e3
+
+            tracemalloc.start()
+            for case in group:
+                quiet(run_case, case, server.url(case['url']))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{key:<24} {pages:>5} {pages_per_second:>9.1f} {kb_per_page:>8.1f} {peak / 1e6:>8.1f}")
+
+    print("-" * 59)
+    if not failures:
+        print(f"Output: all {len(cases)} cases match the recorded expectations")
+        return True
+    if update:
+        print(f"Output: updated expectations for {len(failures)} cases: {', '.join(failures)}")
+        return True
+    print(f"Output: {len(failures)} of {len(cases)} cases differ: {', '.join(failures)}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay scraper fixtures")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="Download fresh fixtures from the live sites")
+    record_parser.add_argument('--rounds', default='1,2', help="Rounds per competition (default: 1,2)")
+    record_parser.add_argument('--teams-per-league', type=int, default=2,
+                               help="Team pages to record per league (default: 2)")
+    record_parser.add_argument('--delay', type=float, default=1.0,
+                               help="Seconds between live requests (default: 1)")
+
+    synthesize_parser = subparsers.add_parser(
+        'synthesize', help="Build offline fixtures from data/matches.json and data/teams.json")
+    synthesize_parser.add_argument('--rounds', default='1,2', help="Rounds per competition (default: 1,2)")
+    synthesize_parser.add_argument('--teams-per-league', type=int, default=2,
+                                   help="Team pages per league (default: 2)")
+
+    replay_parser = subparsers.add_parser('replay', help="Check and benchmark the scrapers against fixtures")
+    replay_parser.add_argument('--passes', type=int, default=5, help="Timed passes per scraper (default: 5)")
+    replay_parser.add_argument('--update', action='store_true',
+                               help="Accept the current output as the new expectation")
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(parse_rounds(args.rounds), args.teams_per_league, args.delay)
+    elif args.command == 'synthesize':
+        synthesize(parse_rounds(args.rounds), args.teams_per_league)
+    elif not replay(args.passes, args.update):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
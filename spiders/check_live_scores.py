@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Live Score Regression Check
+Runs `update_scores.py --live --once` end to end against a local stand-in
+of resultados-futbol.com (fixture_server.py), in a scratch copy of spiders/
+and data/ so the real matches.json is never touched.
+
+Two matches of one round are moved to today: one kicked off a few minutes
+ago and is served as live 1-0, the other kicks off shortly and is served
+as not started. The check passes when the first one is written back as
+live 1-0 and the second one is left as it was.
+
+Usage:
+    python spiders/check_live_scores.py [--verbose]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fixture_server import FixtureServer
+from resultados_scraper import COMPETITIONS, round_url
+from site_fixtures import round_page
+
+BASE_DIR = Path(__file__).parent.parent
+BRAZIL_TZ = timezone(timedelta(hours=-3))
+
+LIVE_SCORE = {'home': 1, 'away': 0}
+
+
+def pick_round(matches):
+    """Two matches of the first registry round found in data/matches.json"""
+    tournaments = {competition['tournament']: competition for competition in COMPETITIONS.values()}
+    rounds = {}
+    for match in matches:
+        if match.get('tournament') in tournaments and match.get('round'):
+            rounds.setdefault((match['tournament'], match['round']), []).append(match)
+    for (tournament, round_name), round_matches in rounds.items():
+        number = re.search(r"\d+", round_name)
+        if len(round_matches) >= 2 and number:
+            return tournaments[tournament], int(number.group(0)), round_matches[:2]
+    raise SystemExit("No round with two matches in data/matches.json")
+
+
+def stage(matches, now):
+    """Move two matches of a round to today; returns (round url, live id, upcoming id, page)"""
+    competition, number, (live, upcoming) = pick_round(matches)
+    # Both kickoffs stay on today's Brazil date, even around midnight
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    kickoffs = (max(now - timedelta(minutes=5), midnight),
+                min(now + timedelta(minutes=10), midnight + timedelta(hours=23, minutes=59)))
+    for match, kickoff in zip((live, upcoming), kickoffs):
+        match.update(matchDate=kickoff.isoformat(timespec='seconds'),
+                     status='scheduled', score={'home': None, 'away': None})
+
+    # The stand-in page: the first match under way, the second not started
+    served = [dict(live, status='live', score=LIVE_SCORE), dict(upcoming)]
+    return round_url(competition, number), live['id'], upcoming['id'], round_page(served)
+
+
+def make_scratch_site(root):
+    ignore = shutil.ignore_patterns('__pycache__', '*.pyc', 'fixtures')
+    shutil.copytree(BASE_DIR / 'spiders', root / 'spiders', ignore=ignore)
+    shutil.copytree(BASE_DIR / 'data', root / 'data', ignore=ignore)
+
+
+def run(verbose=False):
+    now = datetime.now(BRAZIL_TZ)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_scratch_site(root)
+        matches_file = root / 'data' / 'matches.json'
+        with open(matches_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        url, live_id, upcoming_id, page = stage(data['matches'], now)
+        with open(matches_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        before = {match['id']: match for match in data['matches']}
+
+        # Local updates only: no .env in the scratch site and no emulator
+        env = {key: value for key, value in os.environ.items() if key != 'FIRESTORE_EMULATOR_HOST'}
+        with FixtureServer({url: ('text/html; charset=utf-8', page.encode('utf-8'))}) as server:
+            proc = subprocess.run(
+                [sys.executable, str(root / 'spiders' / 'update_scores.py'),
+                 '--live', '--once', '--base-url', server.base_url],
+                cwd=root, env=env, capture_output=True, text=True, timeout=120,
+            )
+            polled = server.requests
+
+        if verbose or proc.returncode:
+            print(proc.stdout + proc.stderr)
+
+        with open(matches_file, 'r', encoding='utf-8') as f:
+            after = {match['id']: match for match in json.load(f)['matches']}
+        live, upcoming = after[live_id], after[upcoming_id]
+        failures = []
+        if proc.returncode:
+            failures.append(f"update_scores.py exited with {proc.returncode}")
+        if not polled:
+            failures.append("the round page was never requested")
+        if live.get('status') != 'live' or live.get('score') != LIVE_SCORE:
+            failures.append(f"{live_id}: expected live 1-0, got {live.get('status')} {live.get('score')}")
+        if upcoming != before[upcoming_id]:
+            failures.append(f"{upcoming_id}: changed although it has not kicked off")
+        others = [match_id for match_id in before if match_id not in (live_id, upcoming_id)
+                  and after.get(match_id) != before[match_id]]
+        if others:
+            failures.append(f"{len(others)} other matches changed: {', '.join(others[:5])}")
+
+    print(f"Round page: {url} ({polled} requests)")
+    if failures:
+        for failure in failures:
+            print(f"FAIL {failure}")
+        return False
+    print(f"OK {live_id} -> live 1-0, {upcoming_id} unchanged")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check update_scores.py --live against a local stand-in")
+    parser.add_argument('--verbose', action='store_true', help="Show the update_scores.py output")
+    args = parser.parse_args()
+    if not run(args.verbose):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import os
 import requests
 from pathlib import Path
 import time
+from http_cache import HTTPCache
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -17,6 +18,9 @@ CANAIS_DIR = ASSETS_DIR / 'canais'
 for directory in [TIMES_DIR, CAMPEONATOS_DIR, CANAIS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Logos are cached on disk and revalidated on reruns
+http_cache = HTTPCache()
+
 # Team logos
 TEAMS_LOGOS = {
     'flamengo': 'https://upload.wikimedia.org/wikipedia/commons/thumb/9/93/Flamengo-RJ_%28BRA%29.png/150px-Flamengo-RJ_%28BRA%29.png',
@@ -71,7 +75,7 @@ def download_image(url, filepath, retries=3):
     for attempt in range(retries):
         try:
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_cache.get(url, headers=headers, timeout=10)
             response.raise_for_status()
             
             with open(filepath, 'wb') as f:
@@ -136,6 +140,7 @@ def download_all_logos():
     print("=" * 60)
     print("[SUCCESS] Logo download complete!")
     print("[INFO] Logos saved to: " + str(ASSETS_DIR))
+    print("[INFO] " + http_cache.summary())
     print("=" * 60)
 
 def list_downloaded_logos():
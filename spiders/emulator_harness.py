@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Firestore Emulator Integration Harness
+Runs the Firestore write path of every script against the local Firestore
+emulator instead of production, with no credentials needed:
+
+    upload      upload_json_to_firestore.py (full upload, then --sync --remote)
+    scores      update_scores.py (fills the null scores, then reruns)
+    match-pages generate_match_pages.py (generate, then rerun)
+    team-pages  generate_team_pages.py (league pages served locally, then rerun)
+    news        publish_news.py publish_to_firestore (publish, then republish)
+
+The steps run in that order on one emulator database, each in its own
+process inside a scratch copy of the site (so generated pages and
+matches.json edits never touch the working tree), starting from an empty
+database seeded by the upload step from data/*.json. Per step it reports
+wall time, Firestore RPCs, documents written (writes in Commit/BatchWrite)
+and documents read (RunQuery/BatchGetDocuments results).
+
+Reruns over unchanged data that must not write anything are checked
+against that, and the RPC, write and read counts are compared with the
+baseline recorded by --update (spiders/fixtures/emulator/baseline.json,
+meant to be committed), so rewriting unchanged documents shows up as a
+failure.
+
+The emulator is started with gcloud or the firebase CLI (needs Java)
+unless FIRESTORE_EMULATOR_HOST already points at a running one.
+
+Usage:
+    python spiders/emulator_harness.py [--port 8181] [--verbose]
+    python spiders/emulator_harness.py --update     # accept current counts
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from firebase_client import EMULATOR_PROJECT
+
+BASE_DIR = Path(__file__).parent.parent
+BASELINE_FILE = Path(__file__).parent / 'fixtures' / 'emulator' / 'baseline.json'
+
+# What the scripts read at BASE_DIR besides spiders/ and data/
+SITE_FILES = ['match.html', 'team.html', 'noticias/post_template.html']
+
+# Left out of the scratch data/ so every run starts from the same state
+SCRATCH_EXCLUDE = ['firestore_snapshot.json.gz']
+
+# GAPIC Firestore methods counted as RPCs
+RPC_METHODS = (
+    'get_document', 'list_documents', 'create_document', 'update_document', 'delete_document',
+    'batch_get_documents', 'run_query', 'run_aggregation_query', 'partition_query',
+    'list_collection_ids', 'begin_transaction', 'commit', 'rollback', 'batch_write',
+)
+
+NEWS_ITEMS = 5
+
+
+# =============================================================================
+# RPC counting (inside each step process)
+# =============================================================================
+
+class RPCCounter:
+    """Counts Firestore RPCs and the documents they write or return"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.docs_written = 0
+        self.docs_read = 0
+
+    def install(self):
+        from google.cloud.firestore_v1.services.firestore.client import FirestoreClient
+        for name in RPC_METHODS:
+            setattr(FirestoreClient, name, self.wrap(name, getattr(FirestoreClient, name)))
+
+    def wrap(self, name, method):
+        counter = self
+
+        def counted(client, *args, **kwargs):
+            request = kwargs.get('request', args[0] if args else None)
+            with counter.lock:
+                counter.calls[name] = counter.calls.get(name, 0) + 1
+                if name in ('commit', 'batch_write'):
+                    writes = request.get('writes') if isinstance(request, dict) else getattr(request, 'writes', None)
+                    counter.docs_written += len(writes or ())
+            response = method(client, *args, **kwargs)
+            if name in ('run_query', 'batch_get_documents'):
+                return CountingStream(response, counter)
+            return response
+
+        return counted
+
+    def add_read(self):
+        with self.lock:
+            self.docs_read += 1
+
+    def stats(self):
+        return {
+            'rpcs': sum(self.calls.values()),
+            'calls': dict(sorted(self.calls.items())),
+            'docsWritten': self.docs_written,
+            'docsRead': self.docs_read,
+        }
+
+
+class CountingStream:
+    """Response stream wrapper counting the documents it yields"""
+
+    def __init__(self, stream, counter):
+        self.stream = stream
+        self.counter = counter
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        response = next(self.stream)
+        document = getattr(response, 'document', None) or getattr(response, 'found', None)
+        if document is not None and document.name:
+            self.counter.add_read()
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+# =============================================================================
+# Steps (each runs in a fresh process with cwd = <scratch>/spiders)
+# =============================================================================
+
+def step_upload():
+    import upload_json_to_firestore
+    upload_json_to_firestore.main()
+
+
+def step_upload_sync():
+    import upload_json_to_firestore
+    upload_json_to_firestore.sync_all(remote=True)
+
+
+def step_scores():
+    import update_scores
+    update_scores.update_scores(results_source=str(BASE_DIR / 'results.jsonl'))
+
+
+def step_match_pages():
+    import generate_match_pages
+    generate_match_pages.generate_match_pages()
+
+
+def step_team_pages():
+    import generate_team_pages
+    from fixture_server import FixtureServer
+    from site_fixtures import league_pages
+
+    generate_team_pages.http_cache.enabled = False
+    with FixtureServer(league_pages(generate_team_pages.CAMPEONATOS)) as server:
+        for league, url in list(generate_team_pages.CAMPEONATOS.items()):
+            generate_team_pages.CAMPEONATOS[league] = server.url(url)
+        generate_team_pages.generate_all_team_pages()
+
+
+def step_news():
+    import publish_news
+    from firebase_client import get_db
+
+    db = get_db()
+    for number in range(1, NEWS_ITEMS + 1):
+        news_data = {
+            'slug': f"harness-news-{number}",
+            'title': f"Harness news {number}",
+            'subtitle': "Published by the emulator harness",
+            'main_image': "/assets/news/harness.png",
+            'timestamp': "2026-01-01T12:00:00",
+        }
+        publish_news.publish_to_firestore(db, news_data, f"/noticias/harness-news-{number}.html")
+
+
+# (label, function, expected documents written or None)
+STEPS = [
+    ('upload', step_upload, None),
+    ('upload --sync (unchanged)', step_upload_sync, 0),
+    ('scores', step_scores, None),
+    ('scores (rerun)', step_scores, 0),
+    ('match-pages', step_match_pages, None),
+    ('match-pages (rerun)', step_match_pages, 0),
+    ('team-pages', step_team_pages, None),
+    ('team-pages (rerun)', step_team_pages, 0),
+    ('news', step_news, None),
+    ('news (rerun)', step_news, None),
+]
+
+
+def run_step(index, stats_path):
+    """Entry point of a step process: run the step and write its counts"""
+    counter = RPCCounter()
+    counter.install()
+    _, func, _ = STEPS[index]
+    start = time.perf_counter()
+    try:
+        func()
+    except ModuleNotFoundError as e:
+        # A script whose optional dependency is missing (e.g. python-docx)
+        stats = {'skipped': f"{e.name} is not installed"}
+    else:
+        stats = counter.stats()
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+    with open(stats_path, 'w', encoding='utf-8') as f:
+        json.dump(stats, f)
+
+
+# =============================================================================
+# Scratch site and seed data
+# =============================================================================
+
+def write_results(path):
+    """Finished results for every match of data/matches.json without a score"""
+    with open(BASE_DIR / 'data' / 'matches.json', 'r', encoding='utf-8') as f:
+        matches = json.load(f)['matches']
+    with open(path, 'w', encoding='utf-8') as f:
+        for match in matches:
+            score = match.get('score') or {}
+            if score.get('home') is None or score.get('away') is None:
+                result = dict(match, status='finished', score={'home': 1, 'away': 0})
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def make_scratch_site(root):
+    ignore = shutil.ignore_patterns('__pycache__', '*.pyc', 'fixtures', *SCRATCH_EXCLUDE)
+    shutil.copytree(BASE_DIR / 'spiders', root / 'spiders', ignore=ignore)
+    shutil.copytree(BASE_DIR / 'data', root / 'data', ignore=ignore)
+    for name in SITE_FILES:
+        if (BASE_DIR / name).exists():
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(BASE_DIR / name, root / name)
+    write_results(root / 'results.jsonl')
+
+
+# =============================================================================
+# Emulator
+# =============================================================================
+
+def emulator_command(port, root):
+    if shutil.which('gcloud'):
+        return ['gcloud', 'emulators', 'firestore', 'start', f'--host-port=127.0.0.1:{port}']
+    if shutil.which('firebase'):
+        with open(root / 'firebase.json', 'w', encoding='utf-8') as f:
+            json.dump({'emulators': {'firestore': {'host': '127.0.0.1', 'port': port}}}, f)
+        return ['firebase', 'emulators:start', '--only', 'firestore', '--project', EMULATOR_PROJECT]
+    raise SystemExit("Neither gcloud nor the firebase CLI is installed; "
+                     "start the Firestore emulator yourself and set FIRESTORE_EMULATOR_HOST")
+
+
+def wait_for_emulator(host, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"http://{host}/", timeout=2).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"Firestore emulator at {host} did not come up within {timeout} s")
+
+
+@contextlib.contextmanager
+def emulator(port, root, log_file):
+    """Yield the host of a running emulator, starting one if needed"""
+    host = os.getenv('FIRESTORE_EMULATOR_HOST')
+    if host:
+        wait_for_emulator(host, timeout=5)
+        yield host
+        return
+
+    host = f"127.0.0.1:{port}"
+    print(f"Starting the Firestore emulator on {host}...")
+    process = subprocess.Popen(emulator_command(port, root), cwd=root, stdout=log_file,
+                               stderr=subprocess.STDOUT, start_new_session=True)
+    try:
+        wait_for_emulator(host)
+        yield host
+    finally:
+        # The CLIs start the Java emulator as a child: stop the whole group
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGTERM)
+        else:
+            process.terminate()
+        process.wait(timeout=30)
+
+
+def reset_emulator(host):
+    """Delete every document in the emulator database"""
+    url = f"http://{host}/emulator/v1/projects/{EMULATOR_PROJECT}/databases/(default)/documents"
+    requests.delete(url, timeout=30).raise_for_status()
+
+
+# =============================================================================
+# Report
+# =============================================================================
+
+def load_baseline():
+    if not BASELINE_FILE.exists():
+        return {}
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results):
+    BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {label: {'rpcs': stats['rpcs'], 'docsWritten': stats['docsWritten'],
+                        'docsRead': stats['docsRead']}
+                for label, stats in results.items()}
+    with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def check_step(label, stats, expected_writes, baseline):
+    """Problems found in one step's counts"""
+    problems = []
+    if expected_writes is not None and stats['docsWritten'] != expected_writes:
+        problems.append(f"wrote {stats['docsWritten']} documents, expected {expected_writes}")
+    previous = baseline.get(label)
+    if previous:
+        for key in ('rpcs', 'docsWritten', 'docsRead'):
+            if stats[key] > previous[key]:
+                problems.append(f"{key} {previous[key]} -> {stats[key]}")
+    return problems
+
+
+def run(port, verbose=False, update=False):
+    baseline = load_baseline()
+    results = {}
+    failures = []
+
+    with tempfile.TemporaryDirectory(prefix='ovpfh-emulator-') as tmp:
+        root = Path(tmp)
+        make_scratch_site(root)
+        log_path = root / 'harness.log'
+
+        with open(log_path, 'w', encoding='utf-8') as log_file, emulator(port, root, log_file) as host:
+            reset_emulator(host)
+            env = dict(os.environ, FIRESTORE_EMULATOR_HOST=host, FIREBASE_PROJECT_ID=EMULATOR_PROJECT,
+                       PYTHONIOENCODING='utf-8')
+
+            print(f"{'step':<28} {'seconds':>8} {'RPCs':>6} {'written':>8} {'read':>6}")
+            for index, (label, _, expected_writes) in enumerate(STEPS):
+                stats_path = root / f"step-{index}.json"
+                log_file.write(f"\n===== {label} =====\n")
+                log_file.flush()
+                completed = subprocess.run(
+                    [sys.executable, 'emulator_harness.py', '--step', str(index), str(stats_path)],
+                    cwd=root / 'spiders', env=env,
+                    stdout=None if verbose else log_file, stderr=subprocess.STDOUT,
+                )
+                if completed.returncode != 0 or not stats_path.exists():
+                    print(f"{label:<28} FAILED (exit code {completed.returncode})")
+                    failures.append((label, ["step crashed"]))
+                    continue
+
+                with open(stats_path, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                if 'skipped' in stats:
+                    print(f"{label:<28} skipped ({stats['skipped']})")
+                    continue
+                results[label] = stats
+                print(f"{label:<28} {stats['seconds']:>8.2f} {stats['rpcs']:>6} "
+                      f"{stats['docsWritten']:>8} {stats['docsRead']:>6}")
+                problems = check_step(label, stats, expected_writes, {} if update else baseline)
+                if problems:
+                    failures.append((label, problems))
+
+        if failures and not verbose:
+            # Keep the scripts' output: the scratch directory is deleted on exit
+            saved_log = BASE_DIR / 'emulator_harness.log'
+            shutil.copy2(log_path, saved_log)
+            print(f"\nStep output saved to {saved_log}")
+
+    print("-" * 60)
+    if update:
+        save_baseline(results)
+        print(f"Baseline updated: {BASELINE_FILE}")
+    elif not baseline:
+        print(f"No baseline yet, run with --update to record one at {BASELINE_FILE}")
+
+    if not failures:
+        print(f"All {len(results)} steps passed")
+        return True
+    for label, problems in failures:
+        print(f"{label}: {'; '.join(problems)}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run every Firestore write path against the local emulator")
+    parser.add_argument('--port', type=int, default=8181, help="Emulator port when starting one (default: 8181)")
+    parser.add_argument('--verbose', action='store_true', help="Show the scripts' output")
+    parser.add_argument('--update', action='store_true', help="Record the current counts as the baseline")
+    parser.add_argument('--step', nargs=2, metavar=('INDEX', 'STATS_FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.step:
+        run_step(int(args.step[0]), args.step[1])
+    elif not run(args.port, args.verbose, args.update):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Shared Firebase Client
+One Firestore client per process for all spiders. firebase_admin and the
+google-cloud-firestore/grpc import tree behind it are only loaded when a
+client (or a Firestore sentinel) is first needed, so --help, dry runs and
+offline runs start without them.
+
+Credentials come from the FIREBASE_* variables in .env. Setting
+FIRESTORE_EMULATOR_HOST (e.g. localhost:8080) targets the local Firestore
+emulator instead; no credentials are needed then and the project is
+FIREBASE_PROJECT_ID or EMULATOR_PROJECT.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+ENV_FILE = BASE_DIR / '.env'
+
+# Project used on the emulator when FIREBASE_PROJECT_ID is not set
+# ("demo-" projects never reach production)
+EMULATOR_PROJECT = 'demo-ovpfh'
+
+_db = None
+_lock = threading.Lock()
+
+
+def load_env():
+    """Load .env into the environment; returns False if the file is missing"""
+    if not ENV_FILE.exists():
+        return False
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+    return True
+
+
+def emulator_host():
+    return os.getenv("FIRESTORE_EMULATOR_HOST")
+
+
+def credentials_dict():
+    """Service account credentials from the FIREBASE_* environment variables"""
+    return {
+        "type": os.getenv("FIREBASE_TYPE", "service_account"),
+        "project_id": os.getenv("FIREBASE_PROJECT_ID"),
+        "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
+        "private_key": os.getenv("FIREBASE_PRIVATE_KEY", "").replace('\\n', '\n'),
+        "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
+        "client_id": os.getenv("FIREBASE_CLIENT_ID"),
+        "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
+        "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
+        "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
+        "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
+        "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
+    }
+
+
+def emulator_client():
+    """Firestore client for the emulator at FIRESTORE_EMULATOR_HOST"""
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import firestore
+    project = os.getenv("FIREBASE_PROJECT_ID") or EMULATOR_PROJECT
+    print(f"Using Firestore emulator at {emulator_host()} (project {project})")
+    return firestore.Client(project=project, credentials=AnonymousCredentials())
+
+
+def production_client():
+    """Firestore client for the FIREBASE_* service account, reusing an initialized app"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if firebase_admin._apps:
+        return firestore.client()
+
+    cred_dict = credentials_dict()
+    if not cred_dict["project_id"] or not cred_dict["private_key"]:
+        print("ERROR: Missing required Firebase credentials in .env file!")
+        print("Required: FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY")
+        return None
+
+    firebase_admin.initialize_app(credentials.Certificate(cred_dict))
+    print("SUCCESS: Firebase Admin SDK initialized")
+    print("Project: " + cred_dict['project_id'])
+    return firestore.client()
+
+
+def get_db():
+    """Firestore client, created on first call and reused afterwards.
+
+    Returns None (after printing why) when Firebase is not configured or
+    fails to initialize; a later call tries again.
+    """
+    global _db
+    if _db is not None:
+        return _db
+
+    with _lock:
+        if _db is not None:
+            return _db
+
+        if not load_env() and not emulator_host():
+            print("ERROR: .env file not found at " + str(ENV_FILE))
+            return None
+
+        try:
+            _db = emulator_client() if emulator_host() else production_client()
+        except Exception as e:
+            print("ERROR initializing Firebase: " + str(e))
+            print("\nMake sure your .env file contains all required Firebase credentials:")
+            print("   - FIREBASE_PROJECT_ID")
+            print("   - FIREBASE_PRIVATE_KEY")
+            print("   - FIREBASE_CLIENT_EMAIL")
+        return _db
+
+
+def server_timestamp():
+    """firestore.SERVER_TIMESTAMP, without importing the SDK up front"""
+    from google.cloud.firestore import SERVER_TIMESTAMP
+    return SERVER_TIMESTAMP
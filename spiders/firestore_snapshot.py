@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Local Firestore Snapshot Cache
+Keeps a gzipped copy of the site collections (matches, teams, leagues, canais)
+together with each document's update time, so page generation only has to
+fetch documents that changed since the last run, or can run fully offline.
+"""
+
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / 'data'
+SNAPSHOT_FILE = DATA_DIR / 'firestore_snapshot.json.gz'
+
+# Firestore collection -> (local JSON file, top-level key) used by --offline
+COLLECTIONS = {
+    'matches': ('matches.json', 'matches'),
+    'teams': ('teams.json', 'teams'),
+    'leagues': ('tournaments.json', 'tournaments'),
+    'canais': ('canais.json', 'canais'),
+}
+
+
+class FirestoreJSONEncoder(json.JSONEncoder):
+    """Custom JSON encoder for Firestore types"""
+    def default(self, obj):
+        if hasattr(obj, 'isoformat'):
+            return obj.isoformat()
+        # Handle Firestore DatetimeWithNanoseconds (which might not have isoformat in some SDK versions/environments)
+        if type(obj).__name__ == 'DatetimeWithNanoseconds':
+            return str(obj)
+        return super().default(obj)
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Return {collection: {doc_id: {'updateTime': str, 'data': dict}}} or {}"""
+    if not path.exists():
+        return {}
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f).get('collections', {})
+    except (OSError, ValueError) as e:
+        print(f"WARNING: Could not read snapshot {path.name}, doing a full load: {e}")
+        return {}
+
+
+def save_snapshot(collections, path=SNAPSHOT_FILE):
+    tmp_path = path.with_suffix('.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump({'savedAt': datetime.now(timezone.utc).isoformat(), 'collections': collections},
+                  f, ensure_ascii=False, separators=(',', ':'), cls=FirestoreJSONEncoder)
+    os.replace(tmp_path, path)
+
+
+def update_time_of(doc):
+    update_time = doc.update_time
+    return update_time.rfc3339() if hasattr(update_time, 'rfc3339') else str(update_time)
+
+
+def sync_collection(db, name, cached):
+    """Bring one cached collection up to date with Firestore.
+
+    With a cached copy, only document names and update times are listed
+    (empty field projection) and just the new or changed documents are
+    fetched in one get_all call; documents gone from Firestore are dropped.
+    Returns (docs, fetched_count).
+    """
+    collection = db.collection(name)
+
+    if not cached:
+        docs = {doc.id: {'updateTime': update_time_of(doc), 'data': doc.to_dict()}
+                for doc in collection.stream()}
+        return dict(sorted(docs.items())), len(docs)
+
+    current = {doc.id: update_time_of(doc) for doc in collection.select([]).stream()}
+    changed = [doc_id for doc_id, update_time in current.items()
+               if cached.get(doc_id, {}).get('updateTime') != update_time]
+
+    docs = {doc_id: cached[doc_id] for doc_id in current if doc_id in cached}
+    if changed:
+        for doc in db.get_all([collection.document(doc_id) for doc_id in changed]):
+            if doc.exists:
+                docs[doc.id] = {'updateTime': update_time_of(doc), 'data': doc.to_dict()}
+
+    # Same order as a full stream (by document id)
+    return dict(sorted(docs.items())), len(changed)
+
+
+def load_local_json():
+    """Read the collections from data/*.json (records already carry their id)"""
+    records = {}
+    for name, (filename, key) in COLLECTIONS.items():
+        path = DATA_DIR / filename
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get(key, [])
+            # Same order Firestore streams documents in, so pages hash the same
+            records[name] = sorted(items, key=lambda item: str(item.get('id', '')))
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Could not load {filename}: {e}")
+            records[name] = []
+    return records
+
+
+def load_collections(db=None, offline=False):
+    """Return {collection: [records]} with each record's 'id' set.
+
+    Online, the snapshot is delta-synced against Firestore and saved back.
+    Offline (or without a client), the snapshot is used as-is, falling back
+    to data/*.json when there is no snapshot yet.
+    """
+    snapshot = load_snapshot()
+
+    if offline or db is None:
+        if not snapshot:
+            print("Offline: no Firestore snapshot found, using data/*.json")
+            return load_local_json()
+        print(f"Offline: using Firestore snapshot {SNAPSHOT_FILE.name}")
+        collections = snapshot
+    else:
+        collections = {}
+        for name in COLLECTIONS:
+            docs, fetched = sync_collection(db, name, snapshot.get(name))
+            print(f"Synced {name}: {len(docs)} docs, {fetched} fetched")
+            collections[name] = docs
+        save_snapshot(collections)
+
+    records = {}
+    for name in COLLECTIONS:
+        records[name] = []
+        for doc_id, doc in collections.get(name, {}).items():
+            record = dict(doc['data'])
+            record['id'] = doc_id
+            records[name].append(record)
+    return records
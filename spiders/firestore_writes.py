@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Batched Firestore Writes
+Groups document writes into Firestore batches (max 500 operations each),
+optionally committed a few at a time in parallel, retries failed commits
+with backoff and falls back to per-document writes so one bad document
+does not sink the rest of its batch.
+"""
+
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+# Firestore limit per batch commit
+MAX_BATCH_SIZE = 500
+
+# Errors that will not go away by retrying (matched by class name, like the
+# DatetimeWithNanoseconds check, so google.api_core is not imported here)
+NON_RETRYABLE_ERRORS = {
+    'NotFound', 'InvalidArgument', 'PermissionDenied', 'FailedPrecondition',
+    'AlreadyExists', 'Unauthenticated',
+}
+
+
+def is_retryable(error):
+    return type(error).__name__ not in NON_RETRYABLE_ERRORS
+
+
+def with_retries(func, retries=3, base_delay=0.5):
+    """Call func(), retrying transient errors with jittered exponential backoff"""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not is_retryable(e):
+                raise
+            time.sleep(base_delay * (2 ** attempt) + random.uniform(0, base_delay))
+
+
+def add_to_batch(batch, write):
+    """Queue one write on a batch. write is (method, doc_ref, data)"""
+    method, doc_ref, data = write
+    if method == 'set':
+        batch.set(doc_ref, data)
+    elif method == 'merge':
+        batch.set(doc_ref, data, merge=True)
+    elif method == 'update':
+        batch.update(doc_ref, data)
+    elif method == 'delete':
+        batch.delete(doc_ref)
+    else:
+        raise ValueError(f"Unknown write method: {method}")
+
+
+def write_document(write):
+    """Apply one write directly to its document (no batch)"""
+    method, doc_ref, data = write
+    if method == 'set':
+        doc_ref.set(data)
+    elif method == 'merge':
+        doc_ref.set(data, merge=True)
+    elif method == 'update':
+        doc_ref.update(data)
+    elif method == 'delete':
+        doc_ref.delete()
+    else:
+        raise ValueError(f"Unknown write method: {method}")
+
+
+def commit_chunk(db, chunk):
+    batch = db.batch()
+    for write in chunk:
+        add_to_batch(batch, write)
+    batch.commit()
+
+
+def chunks(writes, size):
+    """Split any iterable of writes into lists of at most size"""
+    iterator = iter(writes)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def commit_with_fallback(db, chunk, retries):
+    """Commit one chunk; returns (committed, failed)"""
+    try:
+        with_retries(lambda: commit_chunk(db, chunk), retries)
+        return len(chunk), []
+    except Exception as e:
+        print(f"WARNING: Batch of {len(chunk)} writes failed ({e}), retrying per document")
+
+    committed = 0
+    failed = []
+    for write in chunk:
+        try:
+            with_retries(lambda: write_document(write), retries)
+            committed += 1
+        except Exception as e:
+            failed.append((write[1].id, str(e)))
+    return committed, failed
+
+
+def write_in_batches(db, writes, batch_size=MAX_BATCH_SIZE, retries=3, workers=1):
+    """Commit writes in batches of at most batch_size operations.
+
+    writes is any iterable of (method, doc_ref, data) with method one of
+    'set', 'merge' (set with merge=True), 'update' or 'delete'; it is
+    consumed one batch at a time. With workers > 1 up to that many batches
+    are committed in parallel. A batch that still fails after retries is
+    replayed one document at a time so the failure is pinned to the
+    documents that caused it.
+
+    Returns (committed, failed) where failed is a list of (doc_id, error).
+    """
+    batch_size = min(batch_size, MAX_BATCH_SIZE)
+    committed = 0
+    failed = []
+
+    if workers <= 1:
+        for chunk in chunks(writes, batch_size):
+            chunk_committed, chunk_failed = commit_with_fallback(db, chunk, retries)
+            committed += chunk_committed
+            failed.extend(chunk_failed)
+        return committed, failed
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks(writes, batch_size):
+            # Bounded: do not read further ahead than the workers can commit
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_committed, chunk_failed = future.result()
+                    committed += chunk_committed
+                    failed.extend(chunk_failed)
+            pending.add(executor.submit(commit_with_fallback, db, chunk, retries))
+
+        for future in pending:
+            chunk_committed, chunk_failed = future.result()
+            committed += chunk_committed
+            failed.extend(chunk_failed)
+
+    return committed, failed
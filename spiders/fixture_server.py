@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Local HTTP Stand-in
+Serves recorded responses on 127.0.0.1 so the spiders can be benchmarked
+and regression-checked without hitting resultados-futbol.com or Wikipedia.
+Responses are looked up by the original URL's path and query; unknown
+paths get a 404. MediaWikiStandIn also answers MediaWiki API queries from
+a set of articles.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+
+def url_key(url):
+    """Path + query of a URL, the lookup key for recorded responses.
+
+    The path is percent-encoded the way HTTP clients send it, so
+    /wiki/São_Paulo and /wiki/S%C3%A3o_Paulo are the same key.
+    """
+    parts = urlsplit(url)
+    path = quote(unquote(parts.path), safe="/:@!$&'()*+,;=~")
+    return path + ('?' + parts.query if parts.query else '')
+
+
+class FixtureServer:
+    """Context manager serving {original_url: (content_type, body)} locally.
+
+    Usage:
+        with FixtureServer(responses) as server:
+            requests.get(server.url(original_url))
+    """
+
+    def __init__(self, responses, latency=0.0):
+        self.responses = {url_key(url): value for url, value in responses.items()}
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self.server = None
+        self.thread = None
+
+    def respond(self, path):
+        """(content_type, body) for a request path, or None for a 404"""
+        return self.responses.get(url_key(path))
+
+    def handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                fixture.requests += 1
+                if fixture.latency:
+                    threading.Event().wait(fixture.latency)
+                response = fixture.respond(self.path)
+                if response is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                content_type, body = response
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                fixture.bytes_sent += len(body)
+
+        return Handler
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, original_url):
+        """Local URL serving the response recorded for original_url"""
+        return self.base_url + url_key(original_url)
+
+
+class MediaWikiStandIn(FixtureServer):
+    """FixtureServer that also answers /w/api.php queries like a MediaWiki wiki.
+
+    articles maps titles to {'wikitext': lead section, 'extract': plain-text
+    intro}. prop=revisions and prop=extracts queries are answered in the
+    formatversion=2 layout, at most API_TITLE_LIMIT titles per query and
+    EXTRACT_LIMIT extracts per response (the rest via continuation), as
+    the real API does.
+    """
+
+    API_TITLE_LIMIT = 50
+    EXTRACT_LIMIT = 20
+
+    def __init__(self, articles, responses=None, latency=0.0):
+        super().__init__(responses or {}, latency)
+        self.articles = articles
+        self.api_requests = 0
+
+    def respond(self, path):
+        parts = urlsplit(path)
+        if parts.path != '/w/api.php':
+            return super().respond(path)
+        self.api_requests += 1
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        body = json.dumps(self.query(params), ensure_ascii=False).encode('utf-8')
+        return 'application/json; charset=utf-8', body
+
+    def query(self, params):
+        titles = [title for title in params.get('titles', '').split('|') if title]
+        if len(titles) > self.API_TITLE_LIMIT:
+            return {'error': {'code': 'toomanyvalues',
+                              'info': f"Too many values supplied for parameter \"titles\". The limit is {self.API_TITLE_LIMIT}."}}
+
+        props = params.get('prop', '').split('|')
+        # Continuation: the revisions are complete after the first response
+        offset = int(params.get('excontinue', 0))
+        with_revisions = 'revisions' in props and 'excontinue' not in params
+        with_extracts = 'extracts' in props
+
+        pages = []
+        extracted = 0
+        next_offset = None
+        for index, title in enumerate(titles):
+            article = self.articles.get(title)
+            if article is None:
+                pages.append({'ns': 0, 'title': title, 'missing': True})
+                continue
+            page = {'pageid': index + 1, 'ns': 0, 'title': title}
+            if with_revisions:
+                page['revisions'] = [{'slots': {'main': {
+                    'contentmodel': 'wikitext', 'contentformat': 'text/x-wiki',
+                    'content': article.get('wikitext', '')}}}]
+            if with_extracts and index >= offset:
+                if extracted < self.EXTRACT_LIMIT:
+                    page['extract'] = article.get('extract', '')
+                    extracted += 1
+                elif next_offset is None:
+                    next_offset = index
+            pages.append(page)
+
+        response = {'batchcomplete': True, 'query': {'pages': pages}}
+        if next_offset is not None:
+            response['continue'] = {'excontinue': next_offset, 'continue': '||revisions'}
+            del response['batchcomplete']
+        return response
@@ -5,61 +5,54 @@ import os
 from pathlib import Path
 from datetime import datetime
 import re
+import hashlib
+import argparse
 import traceback
-import firebase_admin
-from firebase_admin import credentials, firestore
-from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor
+from firebase_client import get_db
+from firestore_snapshot import FirestoreJSONEncoder, load_collections
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'data'
+BUNDLES_DIR = DATA_DIR / 'bundles'
+MANIFEST_FILE = BASE_DIR / 'match_pages_manifest.json'
 
-class FirestoreJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder for Firestore types"""
-    def default(self, obj):
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        # Handle Firestore DatetimeWithNanoseconds (which might not have isoformat in some SDK versions/environments)
-        if type(obj).__name__ == 'DatetimeWithNanoseconds':
-            return str(obj)
-        return super().default(obj)
-
-def initialize_firebase():
-    """Initialize Firebase Admin SDK using environment variables from .env"""
-    env_path = BASE_DIR / '.env'
-    if not env_path.exists():
-        print("ERROR: .env file not found at " + str(env_path))
-        return None
-    
-    load_dotenv(env_path)
-    
-    try:
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY", "").replace('\\n', '\n')
-        cred_dict = {
-            "type": os.getenv("FIREBASE_TYPE", "service_account"),
-            "project_id": os.getenv("FIREBASE_PROJECT_ID"),
-            "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-            "private_key": private_key,
-            "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-            "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-            "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
-            "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
-            "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-            "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        
-        if not cred_dict["project_id"] or not cred_dict["private_key"]:
-            print("ERROR: Missing required Firebase credentials")
-            return None
-            
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        return firestore.client()
-        
-    except Exception as e:
-        print("ERROR initializing Firebase: " + str(e))
-        return None
+# Pages live at /<tournament>/<date>/<teams>/, three levels below the site root
+PAGE_PREFIX = '../../../'
+SLOT_MARK = '\x00'
+
+# Mirrors channelAliases in match.html: broadcasting channel name -> canais id/slug
+CHANNEL_ALIASES = {
+    'record': 'record',
+    'tv globo': 'globo',
+    'globo': 'globo',
+    'band': 'band',
+    'sbt': 'sbt',
+    'rede-tv': 'redetv',
+    'redetv': 'redetv',
+    'redetv!': 'redetv',
+    'tv-cultura': 'tvcultura',
+    'tv cultura': 'tvcultura',
+    'cultura': 'tvcultura',
+    'sportv': 'sportv',
+    'premiere': 'premiere',
+    'cazetv': 'cazetv',
+    'cazétv': 'cazetv',
+    'caze tv': 'cazetv',
+    'youtube': 'youtube',
+    'hbo-max': 'max',
+    'hbo max': 'max',
+    'max': 'max',
+    'disneyplus': 'disneyplus',
+    'disney+': 'disneyplus',
+    'disney plus': 'disneyplus',
+    'goat-tv': 'goattv',
+    'goat tv': 'goattv',
+    'goattv': 'goattv',
+    'tnt': 'tnt',
+    'tnt sports': 'tnt'
+}
 
 def slugify(text):
     text = text.lower()
@@ -73,60 +66,250 @@ def slugify(text):
     text = text.strip('-')
     return text
 
-def load_data(db):
-    print("Loading data from Firestore...")
-    
-    # Matches
-    docs = db.collection('matches').stream()
-    matches = []
-    for doc in docs:
-        m = doc.to_dict()
-        m['id'] = doc.id
-        matches.append(m)
+def load_data(db, offline=False):
+    if offline:
+        print("Loading data offline...")
+    else:
+        print("Loading data from Firestore...")
+
+    collections = load_collections(db, offline=offline)
+
+    matches = collections['matches']
     print(f"Loaded {len(matches)} matches")
 
-    # Teams
-    docs = db.collection('teams').stream()
-    teams = {}
-    for doc in docs:
-        t = doc.to_dict()
-        t['id'] = doc.id
-        teams[doc.id] = t
+    teams = {t['id']: t for t in collections['teams']}
     print(f"Loaded {len(teams)} teams")
 
-    # Tournaments (Leagues)
-    docs = db.collection('leagues').stream()
-    tournaments = {}
-    for doc in docs:
-        t = doc.to_dict()
-        t['id'] = doc.id
-        tournaments[doc.id] = t
+    tournaments = {t['id']: t for t in collections['leagues']}
     print(f"Loaded {len(tournaments)} leagues")
 
-    # Canais
-    docs = db.collection('canais').stream()
-    canais = []
-    for doc in docs:
-        c = doc.to_dict()
-        c['id'] = doc.id
-        canais.append(c)
+    canais = collections['canais']
     print(f"Loaded {len(canais)} canais")
 
     return matches, teams, tournaments, canais
 
-def generate_match_pages():
-    db = initialize_firebase()
-    if not db:
-        return
+def to_json(data):
+    return json.dumps(data, ensure_ascii=False, cls=FirestoreJSONEncoder)
+
+def find_record(records, slug):
+    """Look up a team/tournament by id, then by slug (same rule as router.js)"""
+    if slug in records:
+        return records[slug]
+    for record in records.values():
+        if record.get('slug') == slug:
+            return record
+    return None
+
+def match_canais(match, canais):
+    """Return only the canais referenced by the match's broadcasting entries"""
+    wanted = set()
+    for entry in match.get('broadcasting') or []:
+        name = str(entry.get('channel', '')).lower().strip()
+        if name in CHANNEL_ALIASES:
+            wanted.add(CHANNEL_ALIASES[name])
+    return [c for c in canais if c.get('id') in wanted or c.get('slug') in wanted]
+
+def write_bundles(teams, tournaments, canais):
+    """Write the shared datasets once as content-hashed JSON bundles.
+
+    Files are named <dataset>.<hash>.json so nginx can cache them forever;
+    data/bundles/manifest.json maps each dataset to its current file.
+    """
+    BUNDLES_DIR.mkdir(parents=True, exist_ok=True)
+    bundles = {}
+    datasets = [
+        ('teams', list(teams.values())),
+        ('tournaments', list(tournaments.values())),
+        ('canais', canais),
+    ]
+    for name, items in datasets:
+        content = to_json({name: items})
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+        filename = f"{name}.{digest}.json"
+        path = BUNDLES_DIR / filename
+        if not path.exists():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        # Drop bundles from previous builds
+        for stale in BUNDLES_DIR.glob(f"{name}.*.json"):
+            if stale.name != filename:
+                stale.unlink()
+        bundles[name] = f"/data/bundles/{filename}"
+
+    with open(BUNDLES_DIR / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(bundles, f, indent=2)
+    print(f"Wrote shared bundles: {', '.join(bundles.values())}")
+    return bundles
+
+def load_manifest():
+    """Load the page build manifest (match id -> page path and input hash)"""
+    if not MANIFEST_FILE.exists():
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('pages', {})
+    except (ValueError, OSError) as e:
+        print(f"WARNING: Could not read {MANIFEST_FILE.name}, rebuilding all pages: {e}")
+        return {}
+
+def save_manifest(pages):
+    tmp_path = MANIFEST_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'pages': pages}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def page_hash(template_hash, static_data_js):
+    """Hash of everything a page is built from.
+
+    static_data_js already serializes the match and the team, tournament and
+    canais records the page references, so together with the template it
+    fully determines the output.
+    """
+    h = hashlib.sha256(template_hash.encode('utf-8'))
+    h.update(static_data_js.encode('utf-8'))
+    return h.hexdigest()
+
+def remove_page(rel_path):
+    """Delete a generated index.html and any directories it leaves empty"""
+    path = BASE_DIR / rel_path
+    index_file = path / 'index.html'
+    if index_file.exists():
+        index_file.unlink()
+    # Walk up to (but not including) BASE_DIR removing empty folders
+    while path != BASE_DIR and path.exists() and not any(path.iterdir()):
+        path.rmdir()
+        path = path.parent
+
+def apply_template_surgery(template, static_data_js, title_text, description_text, prefix):
+    """The replace/regex passes that turn match.html into a match page"""
+    # Inject data and SEO tags
+    page_content = template.replace('</head>', static_data_js + "</head>")
+
+    # Replace title/meta
+    page_content = re.sub(r'(<title id="page-title">)(.*?)(</title>)', rf'\1{title_text}\3', page_content)
+    if 'id="page-title"' not in page_content:
+        page_content = re.sub(r'(<title>)(.*?)(</title>)', rf'<title id="page-title">{title_text}</title>', page_content)
+
+    page_content = re.sub(r'<meta\s+name="description"[^>]*content=".*?"[^>]*>',
+                         f'<meta name="description" id="page-description" content="{description_text}">',
+                         page_content)
+
+    # Fix relative paths
+    page_content = page_content.replace('href="styles.css"', f'href="{prefix}styles.css"')
+    page_content = page_content.replace('src="router.js"', f'src="{prefix}router.js"')
+    page_content = page_content.replace('href="index.html"', f'href="{prefix}index.html"')
+    page_content = page_content.replace('href="campeonatos.html"', f'href="{prefix}campeonatos.html"')
+    page_content = page_content.replace('href="sobre.html"', f'href="{prefix}sobre.html"')
+    page_content = page_content.replace('href="contato.html"', f'href="{prefix}contato.html"')
+    page_content = page_content.replace('href="privacidade.html"', f'href="{prefix}privacidade.html"')
+    page_content = page_content.replace('src="assets/root/logo_8_original_name.png"', f'src="{prefix}assets/root/logo_8_original_name.png"')
+    return page_content
+
+def compile_match_template(template):
+    """Run the template surgery once with marker slots and split on them.
+
+    Returns (parts, slots): parts is the list of literal fragments with
+    placeholders at the indexes listed in slots as (index, slot_name).
+    """
+    if SLOT_MARK in template:
+        raise ValueError("match.html must not contain NUL characters")
+
+    def slot(name):
+        return SLOT_MARK + name + SLOT_MARK
+
+    marked = apply_template_surgery(template, slot('static_data'), slot('title'),
+                                    slot('description'), slot('prefix'))
+    # Odd positions after the split are slot names
+    parts = marked.split(SLOT_MARK)
+    slots = [(i, parts[i]) for i in range(1, len(parts), 2)]
+    return parts, slots
+
+def render_compiled(compiled, **values):
+    parts, slots = compiled
+    page = list(parts)
+    for index, name in slots:
+        page[index] = values[name]
+    return ''.join(page)
+
+def page_texts(home_name, away_name, tournament_name):
+    title_text = f"{home_name} x {away_name} - {tournament_name} | Onde Vai Passar"
+    description_text = f"Onde assistir {home_name} x {away_name} ao vivo. Veja horários, canais de transmissão e detalhes do jogo."
+    return title_text, description_text
+
+def build_static_data_js(match, page_teams, page_tournaments, page_canais):
+    static_data_js = "\n<script>\n"
+    static_data_js += "  window.STATIC_MATCH_DATA = " + to_json(match) + ";\n"
+    static_data_js += "  window.STATIC_TEAMS_DATA = " + to_json(page_teams) + ";\n"
+    static_data_js += "  window.STATIC_TOURNAMENTS_DATA = " + to_json(page_tournaments) + ";\n"
+    static_data_js += "  window.STATIC_CANAIS_DATA = " + to_json(page_canais) + ";\n"
+    static_data_js += "</script>\n"
+    return static_data_js
 
-    matches, teams, tournaments, canais = load_data(db)
+def render_match_page(compiled, static_data_js, home_name, away_name, tournament_name):
+    title_text, description_text = page_texts(home_name, away_name, tournament_name)
+    return render_compiled(compiled, static_data=static_data_js, title=title_text,
+                           description=description_text, prefix=PAGE_PREFIX)
+
+# Compiled template used by write_match_page; set per process by init_page_writer
+_page_template = None
+
+def init_page_writer(compiled):
+    global _page_template
+    _page_template = compiled
+
+def write_match_page(job):
+    """Render and write one page. Runs in the parent or in a pool worker.
+
+    Returns (existed, error) where error is a formatted traceback or None.
+    """
+    rel_path, static_data_js, home_name, away_name, tournament_name = job
+    try:
+        path = BASE_DIR / rel_path
+        index_file = path / 'index.html'
+        existed = index_file.exists()
+        page_content = render_match_page(_page_template, static_data_js, home_name, away_name, tournament_name)
+
+        path.mkdir(parents=True, exist_ok=True)
+        with open(index_file, 'w', encoding='utf-8') as f:
+            f.write(page_content)
+        return existed, None
+    except Exception:
+        return None, traceback.format_exc()
+
+def run_page_jobs(compiled, jobs, workers=1):
+    """Yield write_match_page results for jobs, in order"""
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_page_writer, initargs=(compiled,)) as executor:
+            yield from executor.map(write_match_page, jobs, chunksize=chunksize)
+    else:
+        init_page_writer(compiled)
+        yield from map(write_match_page, jobs)
+
+def generate_match_pages(bundle_static=False, force=False, workers=1, offline=False):
+    db = None
+    if not offline:
+        db = get_db()
+        if not db:
+            return
+
+    matches, teams, tournaments, canais = load_data(db, offline=offline)
+
+    if bundle_static:
+        write_bundles(teams, tournaments, canais)
     
     # Load template
     with open(BASE_DIR / 'match.html', 'r', encoding='utf-8') as f:
         template = f.read()
+    template_hash = hashlib.sha256(template.encode('utf-8')).hexdigest()
+    compiled = compile_match_template(template)
 
-    total_created = 0
-    batch = db.batch()
+    previous_pages = load_manifest()
+    pages = {}
+    jobs = []
+    claimed_paths = {}
+    stats = {'created': 0, 'updated': 0, 'skipped': 0, 'deleted': 0, 'errors': 0}
+    batch = db.batch() if db else None
     batch_count = 0
     
     for match in matches:
@@ -154,9 +337,21 @@ def generate_match_pages():
             
             # URL and Path
             relative_url = f"/{match['tournament']}/{date_slug}/{teams_slug}/"
-            
+            rel_path = f"{match['tournament']}/{date_slug}/{teams_slug}"
+
+            # Two matches on one path would overwrite each other's page
+            # (in no fixed order once the writes run across a process pool)
+            if rel_path in claimed_paths:
+                stats['errors'] += 1
+                if match['id'] in previous_pages:
+                    pages[match['id']] = previous_pages[match['id']]
+                print(f"Skipping match {match['id']}: page path {rel_path} is already "
+                      f"taken by match {claimed_paths[rel_path]}")
+                continue
+            claimed_paths[rel_path] = match['id']
+
             # Update matchURL in Firestore if changed
-            if match.get('matchURL') != relative_url:
+            if db and match.get('matchURL') != relative_url:
                 match_ref = db.collection('matches').document(match['id'])
                 batch.update(match_ref, {'matchURL': relative_url})
                 batch_count += 1
@@ -167,62 +362,88 @@ def generate_match_pages():
 
             match['matchURL'] = relative_url
             
-            path = BASE_DIR / match['tournament'] / date_slug / teams_slug
-            path.mkdir(parents=True, exist_ok=True)
+            path = BASE_DIR / rel_path
             
             # Prepare static data injection
-            static_data_js = "\n<script>\n"
-            static_data_js += "  window.STATIC_MATCH_DATA = " + json.dumps(match, ensure_ascii=False, cls=FirestoreJSONEncoder) + ";\n"
-            static_data_js += "  window.STATIC_TEAMS_DATA = " + json.dumps(list(teams.values()), ensure_ascii=False, cls=FirestoreJSONEncoder) + ";\n"
-            static_data_js += "  window.STATIC_TOURNAMENTS_DATA = " + json.dumps(list(tournaments.values()), ensure_ascii=False, cls=FirestoreJSONEncoder) + ";\n"
-            static_data_js += "  window.STATIC_CANAIS_DATA = " + json.dumps(canais, ensure_ascii=False, cls=FirestoreJSONEncoder) + ";\n"
-            static_data_js += "</script>\n"
-            
-            # Inject data and SEO tags
-            page_content = template.replace('</head>', static_data_js + "</head>")
-            
-            tournament_name = tournament.get('name', match['tournament'])
-            
-            title_text = f"{home_name} x {away_name} - {tournament_name} | Onde Vai Passar"
-            description_text = f"Onde assistir {home_name} x {away_name} ao vivo. Veja horários, canais de transmissão e detalhes do jogo."
-            
-            # Replace title/meta
-            page_content = re.sub(r'(<title id="page-title">)(.*?)(</title>)', rf'\1{title_text}\3', page_content)
-            if 'id="page-title"' not in page_content:
-                page_content = re.sub(r'(<title>)(.*?)(</title>)', rf'<title id="page-title">{title_text}</title>', page_content)
-            
-            page_content = re.sub(r'<meta\s+name="description"[^>]*content=".*?"[^>]*>', 
-                                 f'<meta name="description" id="page-description" content="{description_text}">', 
-                                 page_content)
-
-            # Fix relative paths
-            page_content = page_content.replace('href="styles.css"', 'href="../../../styles.css"')
-            page_content = page_content.replace('src="router.js"', 'src="../../../router.js"')
-            page_content = page_content.replace('href="index.html"', 'href="../../../index.html"')
-            page_content = page_content.replace('href="campeonatos.html"', 'href="../../../campeonatos.html"')
-            page_content = page_content.replace('href="sobre.html"', 'href="../../../sobre.html"')
-            page_content = page_content.replace('href="contato.html"', 'href="../../../contato.html"')
-            page_content = page_content.replace('href="privacidade.html"', 'href="../../../privacidade.html"')
-            page_content = page_content.replace('src="assets/root/logo_8_original_name.png"', 'src="../../../assets/root/logo_8_original_name.png"')
-            # Fix canais.json fetch path - although we injected static data, scripts might still fetch
-            page_content = page_content.replace("fetch('/data/canais.json')", "fetch('../../../data/canais.json')")
-            
-            with open(path / 'index.html', 'w', encoding='utf-8') as f:
-                f.write(page_content)
-            
-            total_created += 1
-            if total_created % 50 == 0:
-                print(f"Generated {total_created} pages...")
+            if bundle_static:
+                # Only the records this page renders; the full sets live in data/bundles/
+                page_teams = [t for t in (find_record(teams, match['homeTeam']), find_record(teams, match['awayTeam'])) if t]
+                page_tournaments = [t for t in (find_record(tournaments, match['tournament']),) if t]
+                page_canais = match_canais(match, canais)
+            else:
+                page_teams = list(teams.values())
+                page_tournaments = list(tournaments.values())
+                page_canais = canais
+
+            static_data_js = build_static_data_js(match, page_teams, page_tournaments, page_canais)
+
+            digest = page_hash(template_hash, static_data_js)
+            previous = previous_pages.get(match['id'])
+            index_file = path / 'index.html'
+
+            if not force and previous and previous['hash'] == digest and previous['path'] == rel_path and index_file.exists():
+                pages[match['id']] = previous
+                stats['skipped'] += 1
+                continue
+
+            # The page moved (date or team names changed): drop the old copy
+            if previous and previous['path'] != rel_path:
+                remove_page(previous['path'])
+
+            jobs.append((match['id'], {'path': rel_path, 'hash': digest},
+                         (rel_path, static_data_js, home_name, away_name, tournament.get('name', match['tournament']))))
                 
         except Exception as e:
+            stats['errors'] += 1
+            # Keep the last good page so it is neither pruned nor forgotten
+            if match.get('id') in previous_pages:
+                pages[match['id']] = previous_pages[match['id']]
             print(f"Error processing match {match.get('id', 'N/A')}: {e}")
             traceback.print_exc()
 
     if batch_count > 0:
         batch.commit()
 
-    print(f"\nFinished! Total pages generated: {total_created}")
-    print("Firestore matches collection updated with matchURLs.")
+    # Render and write the changed pages (optionally across a process pool)
+    results = run_page_jobs(compiled, [job for _, _, job in jobs], workers)
+    for (match_id, entry, _), (existed, error) in zip(jobs, results):
+        if error:
+            stats['errors'] += 1
+            print(f"Error writing page for match {match_id}:\n{error}")
+            if match_id in previous_pages:
+                pages[match_id] = previous_pages[match_id]
+            continue
+
+        pages[match_id] = entry
+        stats['updated' if existed else 'created'] += 1
+        written = stats['created'] + stats['updated']
+        if written % 50 == 0:
+            print(f"Generated {written} pages...")
+
+    # Prune pages whose match no longer exists
+    live_paths = {page['path'] for page in pages.values()}
+    for match_id, previous in previous_pages.items():
+        if match_id not in pages and previous['path'] not in live_paths:
+            remove_page(previous['path'])
+            stats['deleted'] += 1
+
+    save_manifest(pages)
+
+    print(f"\nFinished! Created: {stats['created']}, updated: {stats['updated']}, "
+          f"skipped: {stats['skipped']}, deleted: {stats['deleted']}, errors: {stats['errors']}")
+    if db:
+        print("Firestore matches collection updated with matchURLs.")
 
 if __name__ == "__main__":
-    generate_match_pages()
+    parser = argparse.ArgumentParser(description="Generate static match pages from Firestore data")
+    parser.add_argument('--bundles', action='store_true',
+                        help="Write teams/tournaments/canais once to data/bundles/ and inline only each match's own records")
+    parser.add_argument('--force', action='store_true',
+                        help="Ignore the build manifest and regenerate every page")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Render and write pages across N processes (default: 1, serial)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Build from the local Firestore snapshot (or data/*.json) without connecting to Firestore")
+    args = parser.parse_args()
+
+    generate_match_pages(bundle_static=args.bundles, force=args.force, workers=args.workers, offline=args.offline)
@@ -5,59 +5,39 @@ Scrapes Wikipedia league pages and creates individual team pages.
 Updates Firestore 'teams' collection with Wiki URLs and league info.
 """
 
-import requests
 from bs4 import BeautifulSoup
 from pathlib import Path
-import time
 import re
 import json
-import os
-import firebase_admin
-from firebase_admin import credentials, firestore
-from dotenv import load_dotenv
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from firebase_client import get_db, server_timestamp
+from firestore_writes import write_in_batches
+from http_cache import HTTPCache
+from resultados_scraper.fetcher import AsyncFetcher
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 TEAMS_DIR = BASE_DIR / 'times'
 TEAMS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Helper for Firebase Initialization
-def initialize_firebase():
-    """Initialize Firebase Admin SDK using environment variables from .env"""
-    env_path = BASE_DIR / '.env'
-    if not env_path.exists():
-        print("ERROR: .env file not found at " + str(env_path))
-        return None
-    
-    load_dotenv(env_path)
-    
-    try:
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY", "").replace('\\n', '\n')
-        cred_dict = {
-            "type": os.getenv("FIREBASE_TYPE", "service_account"),
-            "project_id": os.getenv("FIREBASE_PROJECT_ID"),
-            "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-            "private_key": private_key,
-            "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-            "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-            "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
-            "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
-            "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-            "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        
-        if not cred_dict["project_id"] or not cred_dict["private_key"]:
-            print("ERROR: Missing required Firebase credentials")
-            return None
-            
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        return firestore.client()
-        
-    except Exception as e:
-        print("ERROR initializing Firebase: " + str(e))
-        return None
+# Wikipedia pages are cached on disk and revalidated on reruns
+http_cache = HTTPCache()
+
+# League pages fetched at once from Wikipedia, and requests per second
+LEAGUE_CONCURRENCY = 3
+LEAGUE_RATE = 2.0
+
+# Threads writing team pages
+PAGE_WORKERS = 4
+
+# Team fields read back from Firestore to resolve ids and diff the sync
+STORED_TEAM_FIELDS = ['name', 'slug', 'wiki_url', 'leagues']
+
+# Team page template, with {{TEAM_NAME}}, {{LEAGUE_NAME}} and {{WIKI_URL}} slots
+TEAM_TEMPLATE_FILE = Path(__file__).parent / 'templates' / 'team_page.html'
+TEMPLATE_SLOT = re.compile(r'\{\{(\w+)\}\}')
 
 # ... (Previous ESTADOS, CAMPEONATOS constants remain same, including them for completeness)
 ESTADOS = {
@@ -88,118 +68,161 @@ def slugify(text):
     text = text.strip('-')
     return text
 
+def parse_league_teams(content, league_name):
+    """Extract team names and Wikipedia URLs from a league page's wikitables"""
+    soup = BeautifulSoup(content, 'html.parser')
+    teams = {}
+
+    # Look for tables with team information
+    tables = soup.find_all('table', {'class': 'wikitable'})
+
+    for table in tables:
+        rows = table.find_all('tr')
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            for cell in cells:
+                links = cell.find_all('a')
+                for link in links:
+                    href = link.get('href', '')
+                    title = link.get('title', '')
+                    text = link.get_text(strip=True)
+
+                    if href.startswith('/wiki/') and not any(x in href for x in ['Ficheiro:', 'File:', 'Categoria:', 'Category:', 'Wikipedia:', 'Ajuda:']):
+                        if len(text) > 2 and not text.isdigit() and 'futebol' not in text.lower():
+                            if any(x in text for x in ['FC', 'SC', 'EC', 'AC', 'Clube', 'Esporte', 'Sport', 'Futebol']):
+                                wiki_url = 'https://pt.wikipedia.org' + href
+                                teams[text] = {'name': text, 'wiki_url': wiki_url, 'wiki_title': title}
+                            elif any(x in title for x in ['Futebol', 'Clube']):
+                                wiki_url = 'https://pt.wikipedia.org' + href
+                                teams[text] = {'name': text, 'wiki_url': wiki_url, 'wiki_title': title}
+
+    print("[INFO] Found " + str(len(teams)) + " teams in " + league_name)
+    return teams
+
 def extract_teams_from_league(url, league_name):
     """Extract team names and Wikipedia URLs from league page"""
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_cache.get(url, headers=headers, timeout=15)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        teams = {}
-        
-        # Look for tables with team information
-        tables = soup.find_all('table', {'class': 'wikitable'})
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                for cell in cells:
-                    links = cell.find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        title = link.get('title', '')
-                        text = link.get_text(strip=True)
-                        
-                        if href.startswith('/wiki/') and not any(x in href for x in ['Ficheiro:', 'File:', 'Categoria:', 'Category:', 'Wikipedia:', 'Ajuda:']):
-                            if len(text) > 2 and not text.isdigit() and 'futebol' not in text.lower():
-                                if any(x in text for x in ['FC', 'SC', 'EC', 'AC', 'Clube', 'Esporte', 'Sport', 'Futebol']):
-                                    wiki_url = 'https://pt.wikipedia.org' + href
-                                    teams[text] = {'name': text, 'wiki_url': wiki_url, 'wiki_title': title}
-                                elif any(x in title for x in ['Futebol', 'Clube']):
-                                    wiki_url = 'https://pt.wikipedia.org' + href
-                                    teams[text] = {'name': text, 'wiki_url': wiki_url, 'wiki_title': title}
-        
-        print("[INFO] Found " + str(len(teams)) + " teams in " + league_name)
-        return teams
+        return parse_league_teams(response.content, league_name)
         
     except Exception as e:
         print("[ERROR] Failed to extract teams from " + league_name + ": " + str(e))
         return {}
 
+async def crawl_leagues(leagues, on_league, concurrency=LEAGUE_CONCURRENCY, rate=LEAGUE_RATE):
+    """Fetch {league_slug: url} pages concurrently and call on_league(league_slug, teams)
+    as each one is parsed. Per-host limits, retries and caching come from AsyncFetcher."""
+    fetcher = AsyncFetcher(concurrency=concurrency, rate=rate, cache=http_cache)
+
+    async def crawl(league_slug, url):
+        print(f"[LEAGUE] Processing: {league_slug}")
+        try:
+            html = await fetcher.fetch(url)
+            return league_slug, await asyncio.to_thread(parse_league_teams, html, league_slug)
+        except Exception as e:
+            print("[ERROR] Failed to extract teams from " + league_slug + ": " + str(e))
+            return league_slug, {}
+
+    for crawled in asyncio.as_completed([crawl(slug, url) for slug, url in leagues.items()]):
+        league_slug, teams = await crawled
+        on_league(league_slug, teams)
+
+class PageWriter:
+    """Writes team pages on a thread pool as their leagues come in.
+
+    A team found in several leagues gets the page of the last of them in
+    CAMPEONATOS order, as when leagues were processed one after another,
+    so each page is written once, when no later league is still pending.
+    Written pages are remembered with their league's order, so an earlier
+    league arriving afterwards does not write them again.
+
+    On a --leagues run, kept_orders ({page slug: CAMPEONATOS order of the
+    team's latest stored league that is not refreshed}) leaves alone the
+    pages a later league labels, so they match what a full run writes.
+    """
+
+    def __init__(self, executor, leagues, kept_orders=None):
+        self.executor = executor
+        self.order = {league_slug: index for index, league_slug in enumerate(CAMPEONATOS)}
+        self.waiting = {self.order[league_slug] for league_slug in leagues}
+        self.written = dict(kept_orders or {})  # page slug -> league order it was written for
+        self.done = set()
+        self.pending = {}  # page slug -> (league order, league_slug, team_data)
+        self.futures = []
+
+    def add_league(self, league_slug, teams_data):
+        order = self.order[league_slug]
+        self.done.add(order)
+        for team_data in teams_data.values():
+            slug = slugify(team_data['name'])
+            if self.written.get(slug, -1) > order:
+                continue
+            if slug not in self.pending or self.pending[slug][0] <= order:
+                self.pending[slug] = (order, league_slug, team_data)
+
+        last_waiting = max(self.waiting - self.done, default=-1)
+        for slug in [slug for slug, (o, _, _) in self.pending.items() if o > last_waiting]:
+            page_order, page_league, team_data = self.pending.pop(slug)
+            self.written[slug] = page_order
+            self.futures.append(self.executor.submit(create_team_page, team_data, page_league.title()))
+
+    def wait(self):
+        """Number of pages written"""
+        return sum(1 for future in self.futures if future.result())
+
+def compile_template(path=TEAM_TEMPLATE_FILE):
+    """Split a {{SLOT}} template once into literal parts and slot names.
+
+    Returns (parts, slots) as in generate_match_pages.compile_match_template:
+    slot names sit at the odd indexes of parts.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        parts = TEMPLATE_SLOT.split(f.read())
+    return parts, [(i, parts[i]) for i in range(1, len(parts), 2)]
+
+def render_compiled(compiled, **values):
+    parts, slots = compiled
+    page = list(parts)
+    for index, name in slots:
+        page[index] = values[name]
+    return ''.join(page)
+
+def write_if_changed(path, content):
+    """Write content unless the file already holds exactly these bytes.
+
+    Unchanged pages keep their mtime, so nginx and browsers keep reusing
+    their cached copies (ETag/Last-Modified). Returns True if written.
+    """
+    data = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+team_template = compile_template()
+
 def create_team_page(team_data, league_name):
-    """Create an HTML page for a team"""
+    """Render a team's page; returns True if the file changed"""
     team_name = team_data['name']
     wiki_url = team_data.get('wiki_url', '')
     
     slug = slugify(team_name)
     filepath = TEAMS_DIR / (slug + ".html")
     
-    # We always recreate to ensure fresh template/data
-    
-    html_content = """<!DOCTYPE html>
-<html lang="pt-BR">
-<!-- Wikipedia Source: {wiki_url} -->
-<head>
-  <meta charset="UTF-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{team_name} - Jogos, Escalação e Onde Assistir | Onde Vai Passar Futebol Hoje</title>
-  <meta name="description" content="Veja todos os jogos do {team_name}, escalações, estatísticas e onde assistir ao vivo. Acompanhe o {team_name} no {league_name}.">
-  <link rel="icon" type="image/png" href="../assets/favicon.png">
-  <link rel="stylesheet" href="../styles.css">
-</head>
-<body>
-  <header class="header">
-    <div class="container">
-      <div class="header-content">
-        <h1 class="logo"><a href="../index.html" style="color: inherit;">⚽ Futebol Hoje</a></h1>
-      </div>
-    </div>
-  </header>
-
-  <main class="container">
-    <nav class="breadcrumb" style="padding: 1rem 0; color: #BDBDBD;">
-      <a href="../index.html" style="color: #FFD700;">Início</a> › <span>{team_name}</span>
-    </nav>
-    
-    <div style="background: linear-gradient(135deg, rgba(0, 26, 51, 0.9), rgba(0, 8, 20, 0.9)); border: 2px solid #FFD700; border-radius: 16px; padding: 2rem; margin-bottom: 2rem; text-align: center;">
-      <h1 style="font-size: 2.25rem; color: #F2FF00; margin-bottom: 1rem;">{team_name}</h1>
-      <p style="color: #BDBDBD;">{league_name}</p>
-    </div>
-    
-    <section style="margin-bottom: 2rem;">
-      <h2 style="color: #F2FF00;">Sobre o Time</h2>
-      <div style="background: rgba(0, 26, 51, 0.6); border: 1px solid #424242; border-radius: 12px; padding: 1.5rem; color: #E0E0E0;">
-        <p>O <strong>{team_name}</strong> disputa o <strong>{league_name}</strong>.</p>
-        <p><a href="{wiki_url}" target="_blank" style="color: #FFD700;">Ver na Wikipedia</a></p>
-      </div>
-    </section>
-  </main>
-
-  <footer style="text-align: center; padding: 2rem 0; color: #BDBDBD;">
-    <p>&copy; 2026 Onde Vai Passar Futebol Hoje.</p>
-  </footer>
-</body>
-</html>
-""".format(team_name=team_name, league_name=league_name, wiki_url=wiki_url)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    return True
+    html_content = render_compiled(team_template, TEAM_NAME=team_name, LEAGUE_NAME=league_name, WIKI_URL=wiki_url)
+    return write_if_changed(filepath, html_content)
 
-def create_teams_index(teams_dict):
-    """Create an index page listing all teams"""
-    index_path = TEAMS_DIR / "index.html"
-    
-    teams_html = ""
-    for team_name in sorted(teams_dict.keys()):
-        slug = slugify(team_name)
-        team_info = teams_dict[team_name]
-        leagues = ", ".join(team_info.get('leagues', []))
-        wiki_url = team_info.get('wiki_url', '')
-        teams_html += f"""
+def team_card(team_name, team_info):
+    slug = slugify(team_name)
+    leagues = ", ".join(team_info.get('leagues', []))
+    return f"""
         <div style="background: rgba(0, 26, 51, 0.6); border: 1px solid #424242; border-radius: 12px; padding: 1rem; margin-bottom: 1rem;">
           <h3 style="color: #FFD700; margin-bottom: 0.5rem;">
             <a href="{slug}.html" style="color: inherit; text-decoration: none;">{team_name}</a>
@@ -207,6 +230,12 @@ def create_teams_index(teams_dict):
           <p style="color: #BDBDBD; font-size: 0.875rem;">Campeonatos: {leagues}</p>
         </div>
         """
+
+def create_teams_index(teams_dict):
+    """Create an index page listing all teams"""
+    index_path = TEAMS_DIR / "index.html"
+    
+    teams_html = "".join(team_card(team_name, teams_dict[team_name]) for team_name in sorted(teams_dict))
     
     html_content = f"""<!DOCTYPE html>
 <html lang="pt-BR">
@@ -225,23 +254,32 @@ def create_teams_index(teams_dict):
 </body>
 </html>
 """
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    write_if_changed(index_path, html_content)
 
-def generate_all_team_pages():
-    """Generate team pages and sync to Firestore"""
+def generate_all_team_pages(leagues=None, concurrency=LEAGUE_CONCURRENCY, workers=PAGE_WORKERS):
+    """Generate team pages and sync to Firestore.
+
+    leagues limits the run to those CAMPEONATOS keys: only their pages are
+    fetched and their teams' pages rewritten (except those labelled by a
+    later league stored in Firestore), the leagues other competitions
+    stored in Firestore are kept and the teams index is left as it is.
+    """
+    selected = {slug: url for slug, url in CAMPEONATOS.items() if not leagues or slug in leagues}
     
     # Initialize Firebase
-    db = initialize_firebase()
+    db = get_db()
     existing_teams = {}
+    stored_teams = {}
     
     if db:
+        # One query, only the fields the id lookup and the diff need
         print("Loading existing teams from Firestore...")
-        docs = db.collection('teams').stream()
+        docs = db.collection('teams').select(STORED_TEAM_FIELDS).stream()
         for doc in docs:
             data = doc.to_dict()
             t_name = data.get('name', '').lower()
             existing_teams[t_name] = doc.id
+            stored_teams[doc.id] = data
             # Also map slug to id just in case name varies slightly but slug matches
             if data.get('slug'):
                  existing_teams[data.get('slug')] = doc.id
@@ -252,28 +290,41 @@ def generate_all_team_pages():
     print("TEAM PAGE GENERATOR - From Wikipedia")
     print("=" * 60)
     
-    all_teams = {}
-    total_created = 0
+    # A page is labelled with the team's last league in CAMPEONATOS order;
+    # on --leagues runs that may be a stored league that is not refreshed
+    order = {league_slug: index for index, league_slug in enumerate(CAMPEONATOS)}
+    kept_orders = {}
+    if leagues:
+        for data in stored_teams.values():
+            kept = [order[league] for league in data.get('leagues', []) if league in order and league not in selected]
+            if kept and data.get('name'):
+                kept_orders[slugify(data['name'])] = max(kept)
     
-    for league_slug, league_url in CAMPEONATOS.items():
-        print(f"\n[LEAGUE] Processing: {league_slug}")
-        teams_data = extract_teams_from_league(league_url, league_slug)
+    # Leagues are crawled concurrently; pages are written as each one arrives
+    league_teams = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = PageWriter(executor, selected, kept_orders)
         
-        for team_name, team_data in teams_data.items():
-            create_team_page(team_data, league_slug.title())
-            total_created += 1
-            
+        def on_league(league_slug, teams_data):
+            league_teams[league_slug] = teams_data
+            writer.add_league(league_slug, teams_data)
+        
+        asyncio.run(crawl_leagues(selected, on_league, concurrency))
+        total_written = writer.wait()
+    
+    # Merge in CAMPEONATOS order, so leagues and wiki_url do not depend on timing
+    all_teams = {}
+    for league_slug in selected:
+        for team_name, team_data in league_teams.get(league_slug, {}).items():
             if team_name not in all_teams:
                 all_teams[team_name] = {'leagues': [], 'wiki_url': team_data.get('wiki_url', '')}
             all_teams[team_name]['leagues'].append(league_slug)
-        
-        time.sleep(1) 
 
-    # Sync to Firestore
+    # Sync to Firestore: only teams whose wiki_url or leagues changed
     if db:
         print("\nSyncing to Firestore...")
-        batch = db.batch()
-        batch_count = 0
+        writes = []
+        unchanged = 0
         
         for team_name, info in all_teams.items():
             # Try to match with existing team
@@ -282,28 +333,54 @@ def generate_all_team_pages():
             if not team_id:
                 # If new, use slug as ID
                 team_id = slugify(team_name)
-                
-            doc_ref = db.collection('teams').document(team_id)
             
-            batch.set(doc_ref, {
-                'name': team_name,
-                'wiki_url': info.get('wiki_url', ''),
-                'leagues': info.get('leagues', []),
-                'updatedAt': firestore.SERVER_TIMESTAMP
-            }, merge=True)
+            stored = stored_teams.get(team_id, {})
+            team_leagues = info.get('leagues', [])
+            if leagues:
+                # Keep the leagues that were not refreshed in this run
+                kept = [league for league in stored.get('leagues', []) if league not in selected]
+                team_leagues = sorted(kept + team_leagues, key=lambda league: order.get(league, len(order)))
             
-            batch_count += 1
-            if batch_count >= 400:
-                batch.commit()
-                batch = db.batch()
-                batch_count = 0
+            wiki_url = info.get('wiki_url', '')
+            if team_id in stored_teams and stored.get('wiki_url') == wiki_url and stored.get('leagues') == team_leagues:
+                unchanged += 1
+                continue
+                
+            writes.append(('merge', db.collection('teams').document(team_id), {
+                'name': team_name,
+                'wiki_url': wiki_url,
+                'leagues': team_leagues,
+                'updatedAt': server_timestamp()
+            }))
         
-        if batch_count > 0:
-            batch.commit()
+        committed, failed = write_in_batches(db, writes)
+        print(f"Firestore: {committed} teams updated, {unchanged} unchanged, {len(failed)} failed")
+        for team_id, error in failed:
+            print(f"ERROR updating team {team_id}: {error}")
             
-    # Create Index
-    create_teams_index(all_teams)
-    print(f"\nDone! Created {total_created} pages and synced to Firestore.")
+    # Create Index (it lists every league's teams, so only on full runs)
+    if leagues:
+        print("\nTeams index not rebuilt (--leagues run)")
+    else:
+        create_teams_index(all_teams)
+    print(http_cache.summary())
+    print(f"\nDone! Wrote {total_written} new or changed pages and synced to Firestore.")
 
 if __name__ == "__main__":
-    generate_all_team_pages()
+    parser = argparse.ArgumentParser(description="Generate team pages from Wikipedia league pages")
+    parser.add_argument('--leagues',
+                        help="Comma-separated leagues to refresh (default: all): " + ", ".join(CAMPEONATOS))
+    parser.add_argument('--concurrency', type=int, default=LEAGUE_CONCURRENCY,
+                        help=f"League pages fetched at once (default: {LEAGUE_CONCURRENCY})")
+    parser.add_argument('--workers', type=int, default=PAGE_WORKERS,
+                        help=f"Threads writing team pages (default: {PAGE_WORKERS})")
+    args = parser.parse_args()
+
+    leagues = None
+    if args.leagues:
+        leagues = [league.strip() for league in args.leagues.split(',') if league.strip()]
+        unknown = [league for league in leagues if league not in CAMPEONATOS]
+        if unknown:
+            parser.error("unknown leagues: " + ", ".join(unknown))
+
+    generate_all_team_pages(leagues, args.concurrency, args.workers)
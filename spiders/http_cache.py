@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent HTTP Response Cache
+Shared by the spiders so reruns do not re-download unchanged pages.
+
+Bodies are stored gzipped under .http_cache/ together with their ETag /
+Last-Modified headers. A fresh entry (younger than its source's TTL) is
+served without touching the network; a stale one is revalidated with
+If-None-Match / If-Modified-Since, so an unchanged page costs a 304.
+The cache is kept under a size cap by evicting least recently used entries.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Base directories
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / '.http_cache'
+
+# LRU size cap for stored bodies (compressed)
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+# Seconds an entry is served without revalidation, per host
+SOURCE_TTLS = {
+    'pt.wikipedia.org': 7 * 24 * 3600,
+    'upload.wikimedia.org': 30 * 24 * 3600,
+    'www.resultados-futbol.com': 10 * 60,
+}
+DEFAULT_TTL = 3600
+
+# Response headers kept with each entry
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def build_response(url, status_code, headers, content):
+    """requests.Response for a cached body, so callers need no special casing"""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = content
+    return response
+
+
+class HTTPCache:
+    """URL-keyed on-disk cache with conditional revalidation and LRU eviction"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, ttls=None, enabled=True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttls = SOURCE_TTLS if ttls is None else ttls
+        self.enabled = enabled
+        self.total_bytes = None  # measured on first store
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'downloaded': 0}
+
+    def paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.gz"
+
+    def ttl_for(self, url):
+        return self.ttls.get(urlsplit(url).netloc, DEFAULT_TTL)
+
+    def load(self, url):
+        meta_path, body_path = self.paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError, EOFError):
+            return None, None
+        return meta, body
+
+    def store(self, url, response):
+        meta_path, body_path = self.paths(url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+
+        meta = {
+            'url': url,
+            'fetchedAt': time.time(),
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+        }
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_body = body_path.with_name(body_path.name + suffix)
+        with gzip.open(tmp_body, 'wb', compresslevel=6) as f:
+            f.write(response.content)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self.measure()
+            else:
+                self.total_bytes += body_path.stat().st_size - old_size
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def touch(self, url, meta=None):
+        """Mark an entry as recently used, rewriting its metadata if given"""
+        meta_path, body_path = self.paths(url)
+        try:
+            if meta is not None:
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def measure(self):
+        return sum(path.stat().st_size for path in self.cache_dir.glob('*.gz'))
+
+    def evict(self):
+        """Drop least recently used bodies until the cache is 10% under its cap"""
+        bodies = sorted(self.cache_dir.glob('*.gz'), key=lambda path: path.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for body_path in bodies:
+            if self.total_bytes <= target:
+                break
+            size = body_path.stat().st_size
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+            self.total_bytes -= size
+
+    def is_fresh(self, url, meta, ttl=None):
+        age = time.time() - meta['fetchedAt']
+        return age < (self.ttl_for(url) if ttl is None else ttl)
+
+    def fresh(self, url, ttl=None):
+        """Cached response for url if it is still within its TTL, else None"""
+        if not self.enabled:
+            return None
+        meta, body = self.load(url)
+        if meta is None or not self.is_fresh(url, meta, ttl):
+            return None
+        self.touch(url)
+        self.stats['hits'] += 1
+        return build_response(url, 200, meta['headers'], body)
+
+    def get(self, url, session=None, headers=None, timeout=30, ttl=None):
+        """GET url through the cache.
+
+        Returns a requests.Response; cached bodies come back as status 200
+        with the stored headers. Non-200 responses are returned as-is and
+        never cached.
+        """
+        http = session or requests
+        if not self.enabled:
+            return http.get(url, headers=headers, timeout=timeout)
+
+        meta, body = self.load(url)
+        if meta is not None:
+            if self.is_fresh(url, meta, ttl):
+                self.touch(url)
+                self.stats['hits'] += 1
+                return build_response(url, 200, meta['headers'], body)
+
+            conditional = dict(headers or {})
+            if 'ETag' in meta['headers']:
+                conditional['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                conditional['If-Modified-Since'] = meta['headers']['Last-Modified']
+            response = http.get(url, headers=conditional, timeout=timeout)
+            if response.status_code == 304:
+                meta['fetchedAt'] = time.time()
+                for name in KEPT_HEADERS:
+                    if name in response.headers:
+                        meta['headers'][name] = response.headers[name]
+                self.touch(url, meta)
+                self.stats['revalidated'] += 1
+                return build_response(url, 200, meta['headers'], body)
+        else:
+            response = http.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 200:
+            self.store(url, response)
+            self.stats['downloaded'] += 1
+        return response
+
+    def summary(self):
+        return (f"HTTP cache: {self.stats['hits']} hits, {self.stats['revalidated']} revalidated (304), "
+                f"{self.stats['downloaded']} downloaded")
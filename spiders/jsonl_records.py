@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Newline-delimited Match Records
+One JSON object per line (the same dicts found in {"matches": [...]}), so
+the scraper, update_scores.py and upload_json_to_firestore.py can pass
+records to each other through a pipe or a .jsonl file without loading or
+rewriting a whole document.
+
+    python spiders/scrape_resultados.py --jsonl - \
+        | python spiders/update_scores.py --results - --matches-in data/matches.jsonl --matches-out - \
+        | python spiders/upload_json_to_firestore.py --jsonl - --collection matches
+
+"-" means stdin/stdout. Whole JSON documents (.json) are still accepted as
+input, but are loaded at once.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def parse_lines(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_records(source, key='matches'):
+    """Yield records from a .jsonl file or stdin ('-'), one line at a time.
+
+    A .json file is read as a legacy document and its `key` list (or the
+    top-level list) is yielded.
+    """
+    if source == '-':
+        yield from parse_lines(io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8'))
+        return
+
+    path = Path(source)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix == '.json':
+            data = json.load(f)
+            yield from (data.get(key, []) if isinstance(data, dict) else data)
+        else:
+            yield from parse_lines(f)
+
+
+def dump_record(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def write_records(records, dest):
+    """Write records as JSONL to a file (atomically) or stdout ('-'). Returns the count."""
+    count = 0
+    if dest == '-':
+        out = io.TextIOWrapper(sys.__stdout__.buffer, encoding='utf-8', write_through=False)
+        try:
+            for record in records:
+                out.write(dump_record(record))
+                count += 1
+        finally:
+            out.flush()
+            out.detach()
+        return count
+
+    path = Path(dest)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(dump_record(record))
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def logs_to_stderr(*destinations):
+    """Send progress prints to stderr while records are written to stdout"""
+    if '-' in destinations:
+        return contextlib.redirect_stdout(sys.stderr)
+    return contextlib.nullcontext()
@@ -1,14 +1,11 @@
 # -*- coding: utf-8 -*-
-import os
 import re
 from pathlib import Path
 from datetime import datetime
 import json
 import traceback
 from docx import Document
-import firebase_admin
-from firebase_admin import credentials, firestore
-from dotenv import load_dotenv
+from firebase_client import get_db
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -27,49 +24,6 @@ def slugify(text):
     text = re.sub(r'[\s_-]+', '-', text).strip('-')
     return text
 
-def initialize_firebase():
-    """Initialize Firebase Admin SDK using environment variables from .env"""
-    env_path = BASE_DIR / '.env'
-    if not env_path.exists():
-        print("ERROR: .env file not found at " + str(env_path))
-        return None
-    
-    load_dotenv(env_path)
-    
-    try:
-        # Check if already initialized
-        try:
-            return firestore.client()
-        except ValueError:
-            pass
-
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY", "").replace('\\n', '\n')
-        cred_dict = {
-            "type": os.getenv("FIREBASE_TYPE", "service_account"),
-            "project_id": os.getenv("FIREBASE_PROJECT_ID"),
-            "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-            "private_key": private_key,
-            "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-            "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-            "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
-            "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
-            "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-            "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        
-        if not cred_dict["project_id"] or not cred_dict["private_key"]:
-            print("ERROR: Missing required Firebase credentials")
-            return None
-            
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        return firestore.client()
-        
-    except Exception as e:
-        print("ERROR initializing Firebase: " + str(e))
-        return None
-
 def extract_images(doc, slug):
     """Extracts images from docx and saves to assets/news/"""
     images = []
@@ -189,7 +143,7 @@ def publish_to_firestore(db, news_data, html_url):
         print(f"❌ Error publishing to Firestore: {e}")
 
 def main():
-    db = initialize_firebase()
+    db = get_db()
     
     docx_files = list(MD_DIR.glob("*.docx"))
     if not docx_files:
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+resultados-futbol.com match scraper
+===================================
+
+One engine for every competition in competitions.COMPETITIONS (Brasileirão,
+Paulistão, Carioca). Scrapes any set of competitions and rounds in a single
+process with one shared HTTP session and writes one merged resultados file.
+
+Usage:
+    python spiders/scrape_resultados.py
+    python spiders/scrape_resultados.py --competitions paulistao carioca --rounds 5
+    python spiders/scrape_resultados.py --competitions brasileirao --rounds 1-38
+"""
+
+from .competitions import (
+    BASE_URL, COMPETITIONS, canonical_tournament, competition_for_tournament, competition_for_url,
+    round_url,
+)
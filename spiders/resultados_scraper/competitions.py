@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Competition registry for the resultados-futbol.com scraper.
+
+Each entry describes one competition: the tournament id used in data/*.json,
+the round page path, the round range, the venue state and a stadium -> city
+map used to fill in venue cities. 'aliases' lists the URL-derived ids the
+old per-competition scrapers wrote (e.g. paulistaa126), which still appear
+in resultados files saved before the registry existed.
+"""
+
+from typing import Dict, Optional
+
+BASE_URL = "https://www.resultados-futbol.com"
+
+SP_STADIUMS = {
+    'morumbi': 'São Paulo',
+    'cícero pompeu de toledo': 'São Paulo',
+    'pacaembu': 'São Paulo',
+    'allianz parque': 'São Paulo',
+    'neo química arena': 'São Paulo',
+    'vila belmiro': 'Santos',
+    'urbano caldeira': 'Santos',
+    'moisés lucarelli': 'Campinas',
+    'brinco de ouro': 'Campinas',
+    'nabi abi chedid': 'Bragança Paulista',
+    'jorge ismael de biase': 'Novo Horizonte',
+    'alfredo de castilho': 'Bauru',
+    'benito agnelo castellano': 'Rio Claro',
+    'santa cruz': 'Ribeirão Preto',
+    'josé maria de campos maia': 'Mirassol',
+    'walter ribeiro': 'Sorocaba',
+    'primeiro de maio': 'São Bernardo do Campo',
+}
+
+RJ_STADIUMS = {
+    'maracanã': 'Rio de Janeiro',
+    'engenhão': 'Rio de Janeiro',
+    'nilton santos': 'Rio de Janeiro',
+    'são januário': 'Rio de Janeiro',
+}
+
+COMPETITIONS = {
+    'brasileirao': {
+        'tournament': 'brasileiro26',
+        'aliases': ('brasil26',),
+        'path': '/competicion/brasil/2026/grupo1/jornada{round}',
+        'rounds': (1, 38),
+        'state': None,
+        'stadiums': {**SP_STADIUMS, **RJ_STADIUMS},
+    },
+    'paulistao': {
+        'tournament': 'paulistao26',
+        'aliases': ('paulistaa126',),
+        'path': '/competicion/paulistaa1/2026/grupo1/jornada{round}',
+        'rounds': (1, 8),
+        'state': 'SP',
+        'stadiums': SP_STADIUMS,
+    },
+    'carioca': {
+        'tournament': 'carioca26',
+        'aliases': ('carioca_126',),
+        'path': '/competicion/carioca_1/2026/grupo1/jornada{round}',
+        'rounds': (1, 6),
+        'state': 'RJ',
+        'stadiums': RJ_STADIUMS,
+    },
+}
+
+
+def round_url(competition: Dict, round_number: int, base_url: str = BASE_URL) -> str:
+    """Round page URL for a registry entry."""
+    return base_url.rstrip('/') + competition['path'].format(round=round_number)
+
+
+def competition_for_tournament(tournament: str) -> Optional[Dict]:
+    """Registry entry whose tournament id or alias matches (e.g. 'paulistao26')."""
+    for competition in COMPETITIONS.values():
+        if competition['tournament'] == tournament or tournament in competition['aliases']:
+            return competition
+    return None
+
+
+def canonical_tournament(tournament: str) -> str:
+    """Registry tournament id for a legacy alias; other ids are returned as is."""
+    competition = competition_for_tournament(tournament)
+    return competition['tournament'] if competition else tournament
+
+
+def competition_for_url(url: str) -> Optional[Dict]:
+    """Registry entry whose round path prefix appears in url."""
+    for competition in COMPETITIONS.values():
+        prefix = competition['path'].split('{round}')[0].rsplit('/', 1)[0]
+        if prefix in url:
+            return competition
+    return None
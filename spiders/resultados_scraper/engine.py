@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Scraper engine: fetches round pages for the selected competitions
+concurrently (see fetcher.py) and writes a single merged resultados file.
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+from http_cache import HTTPCache
+from jsonl_records import logs_to_stderr, write_records
+
+from .competitions import BASE_URL, COMPETITIONS, round_url
+from .fetcher import (
+    DEFAULT_CONCURRENCY, DEFAULT_RATE, HEADERS, AsyncFetcher, create_session, fetch_and_parse_all,
+)
+from .parser import parse_html_content
+from .state import CHANGES_FILE, RESULTADOS_DIR, STATE_FILE, record_scrape
+
+
+# =============================================================================
+# URL Fetcher
+# =============================================================================
+
+def fetch_and_parse(url: str, session: Optional[requests.Session] = None,
+                    competition: Optional[Dict] = None) -> Dict:
+    """
+    Fetch URL and parse content.
+    """
+    if session is None:
+        response = requests.get(url, headers=HEADERS, timeout=30)
+    else:
+        response = session.get(url, timeout=30)
+    response.raise_for_status()
+
+    return parse_html_content(response.text, url, competition)
+
+
+def parse_rounds(spec: str) -> List[int]:
+    """
+    Round selection: "5", "1-38" or "1,3,5-7".
+    """
+    rounds = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            rounds.extend(range(int(start), int(end) + 1))
+        else:
+            rounds.append(int(part))
+    return sorted(set(rounds))
+
+
+def round_jobs(competition_names: List[str], rounds: Optional[List[int]] = None,
+               base_url: str = BASE_URL) -> List[tuple]:
+    """
+    (url, competition) for the given rounds of each competition (all rounds
+    when rounds is None; rounds outside a competition's range are skipped).
+    """
+    jobs = []
+    for name in competition_names:
+        competition = COMPETITIONS[name]
+        first_round, last_round = competition['rounds']
+        selected = rounds if rounds is not None else range(first_round, last_round + 1)
+        for round_number in selected:
+            if first_round <= round_number <= last_round:
+                jobs.append((round_url(competition, round_number, base_url), competition))
+    return jobs
+
+
+def scrape(competition_names: List[str], rounds: Optional[List[int]] = None,
+           base_url: str = BASE_URL, concurrency: int = DEFAULT_CONCURRENCY,
+           rate: float = DEFAULT_RATE, workers: int = 1, use_cache: bool = True) -> Dict:
+    """
+    Scrape round pages concurrently and return {"matches": [...]} merged
+    across every page fetched, in competition/round order.
+    """
+    jobs = round_jobs(competition_names, rounds, base_url)
+    print(f"Fetching {len(jobs)} round pages "
+          f"(concurrency {concurrency}, {rate:g} req/s per host)")
+
+    cache = HTTPCache(enabled=use_cache)
+    fetcher = AsyncFetcher(create_session(concurrency), concurrency=concurrency, rate=rate, cache=cache)
+    results = asyncio.run(fetch_and_parse_all(jobs, fetcher, workers))
+    if use_cache:
+        print(cache.summary())
+
+    matches = []
+    seen = set()
+    for url, result, error in results:
+        if error:
+            print(f"Error fetching {url}: {error}")
+            continue
+        page_matches = result.get('matches', [])
+        for match in page_matches:
+            if match['id'] in seen:
+                continue
+            seen.add(match['id'])
+            matches.append(match)
+        print(f"  {url}: {len(page_matches)} matches")
+
+    return {"matches": matches}
+
+
+# =============================================================================
+# Main Entry Point
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape match results from resultados-futbol.com")
+    parser.add_argument('--competitions', nargs='+', choices=sorted(COMPETITIONS),
+                        default=sorted(COMPETITIONS), help="Competitions to scrape (default: all)")
+    parser.add_argument('--rounds', default=None,
+                        help="Rounds to scrape, e.g. 5, 1-38 or 1,3,5-7 (default: every round)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Max parallel requests per host (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"Max requests per second per host, 0 for no limit (default: {DEFAULT_RATE:g})")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Parser processes (default: 1, parse in a thread)")
+    parser.add_argument('--base-url', default=BASE_URL, help="Override the site base URL")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always download pages instead of using the HTTP cache")
+    # Output mode; without either flag a full snapshot is written to resultados/
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--diff', action='store_true',
+                        help="Append only new/changed matches to resultados/changes.jsonl "
+                             "instead of writing a full snapshot")
+    output.add_argument('--jsonl', metavar='DEST',
+                        help="Write one match per line to DEST ('-' for stdout) instead of a snapshot")
+    parser.add_argument('--compact', action='store_true',
+                        help="With --diff, fold the change log into current_resultados.json now")
+    args = parser.parse_args()
+    if args.compact and not args.diff:
+        parser.error("--compact only applies to --diff")
+
+    with logs_to_stderr(args.jsonl):
+        return run(args)
+
+
+def run(args):
+    rounds = parse_rounds(args.rounds) if args.rounds else None
+
+    print(f"Competitions: {', '.join(args.competitions)}")
+    print("-" * 60)
+
+    result = scrape(args.competitions, rounds, args.base_url, args.concurrency, args.rate, args.workers,
+                    not args.no_cache)
+    if not result['matches']:
+        print("No matches scraped, nothing saved")
+        return None
+
+    if args.jsonl:
+        count = write_records(result['matches'], args.jsonl)
+        print(f"Wrote {count} match records to {'stdout' if args.jsonl == '-' else args.jsonl}")
+        return result
+
+    if args.diff:
+        written, compacted = record_scrape(result['matches'], args.compact)
+        print("-" * 60)
+        print(f"Total matches: {len(result['matches'])}, new or changed: {written}")
+        print(f"Changes appended to: {CHANGES_FILE}")
+        if compacted:
+            print(f"Compacted into: {STATE_FILE}")
+        return result
+
+    output_json = json.dumps(result, indent=2, ensure_ascii=False)
+
+    # Save to file with datetime filename
+    RESULTADOS_DIR.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%d%m%Y-%H%M%S")
+    filename = RESULTADOS_DIR / f"{timestamp}_resultados.json"
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(output_json)
+
+    print("-" * 60)
+    print(f"Total matches: {len(result['matches'])}")
+    print(f"Saved to: {filename}")
+
+    return result
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent page fetching for the scraper engine.
+
+Round pages are downloaded concurrently from asyncio over one pooled
+keep-alive requests.Session (each blocking get runs in a worker thread),
+with a per-host concurrency cap, a per-host token-bucket rate limit and
+retries with jittered exponential backoff. Each page is handed to the
+parser as soon as it arrives, so parsing overlaps the remaining downloads.
+"""
+
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .parser import parse_html_content
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+# Per-host politeness defaults
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0  # requests per second
+DEFAULT_RETRIES = 3
+REQUEST_TIMEOUT = 30
+
+# Responses worth retrying; anything else is returned as an error right away
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def create_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    """Session with the scraper headers and a keep-alive pool of pool_size per host."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Fetches URLs politely: per-host concurrency cap, rate limit and retries.
+
+    With an http_cache.HTTPCache, fresh pages are served from disk and stale
+    ones are revalidated with a conditional GET.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 retries: int = DEFAULT_RETRIES, base_delay: float = 1.0, cache=None):
+        self.session = session or create_session(concurrency)
+        self.cache = cache
+        self.concurrency = concurrency
+        self.rate = rate
+        self.retries = retries
+        self.base_delay = base_delay
+        self.hosts = {}
+
+    def limits_for(self, url: str) -> Tuple[asyncio.Semaphore, Optional[TokenBucket]]:
+        host = urlsplit(url).netloc
+        if host not in self.hosts:
+            bucket = TokenBucket(self.rate) if self.rate > 0 else None
+            self.hosts[host] = (asyncio.Semaphore(self.concurrency), bucket)
+        return self.hosts[host]
+
+    def get(self, url: str) -> requests.Response:
+        if self.cache is not None:
+            return self.cache.get(url, session=self.session, timeout=REQUEST_TIMEOUT)
+        return self.session.get(url, timeout=REQUEST_TIMEOUT)
+
+    async def fetch(self, url: str) -> str:
+        """Page body for url, raising the last error once retries run out."""
+        # Fresh cache hits skip the rate limiter entirely
+        if self.cache is not None:
+            cached = self.cache.fresh(url)
+            if cached is not None:
+                return cached.text
+
+        semaphore, bucket = self.limits_for(url)
+
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                if bucket:
+                    await bucket.acquire()
+                try:
+                    response = await asyncio.to_thread(self.get, url)
+                    if response.status_code in RETRYABLE_STATUS:
+                        response.raise_for_status()
+                    break
+                except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                    if attempt == self.retries:
+                        raise
+                    print(f"  Retrying {url} ({e})")
+            await asyncio.sleep(self.base_delay * (2 ** attempt) + random.uniform(0, self.base_delay))
+
+        response.raise_for_status()
+        return response.text
+
+
+async def fetch_and_parse_all(jobs: List[Tuple[str, Dict]], fetcher: AsyncFetcher,
+                              workers: int = 1) -> List[Tuple[str, Optional[Dict], Optional[str]]]:
+    """
+    Fetch and parse every (url, competition) job.
+
+    Parsing of a page starts as soon as its download finishes (in a worker
+    process when workers > 1, else in a thread). Returns
+    (url, parsed_result, error) in job order.
+    """
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    async def run(url, competition):
+        try:
+            html = await fetcher.fetch(url)
+            result = await loop.run_in_executor(pool, parse_html_content, html, url, competition)
+            return url, result, None
+        except Exception as e:
+            return url, None, str(e)
+
+    try:
+        return await asyncio.gather(*(run(url, competition) for url, competition in jobs))
+    finally:
+        if pool:
+            pool.shutdown()
@@ -1,31 +1,47 @@
-#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 """
-Paulistão Match Data Scraper
-============================
-
-Extracts football match data from resultados-futbol.com and outputs JSON format.
-
-Dependencies:
-    pip install requests beautifulsoup4 lxml
-
-Usage:
-    python paulistao_scraper.py
+HTML/text parsers for resultados-futbol.com round pages.
+Shared by every competition in the registry.
 """
 
-import json
 import re
 import unicodedata
 from typing import Optional, Dict, Tuple
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
+from .competitions import COMPETITIONS, competition_for_url
 
-# =============================================================================
-# Configuration
-# =============================================================================
 
-target_url = "https://www.resultados-futbol.com/competicion/carioca_1/2026/grupo1/jornada5"
+# Precompiled patterns
+SLUG_SEPARATORS = re.compile(r'[\s_]+')
+SLUG_INVALID = re.compile(r'[^a-z0-9-]')
+SLUG_DASHES = re.compile(r'-+')
+WHITESPACE = re.compile(r'\s+')
+MATCH_URL_TEAMS = re.compile(r'/partido/([^/]+)/([^/]+)/\d+')
+URL_TOURNAMENT = re.compile(r'/competicion/([^/]+)/(\d{4})')
+URL_ROUND = re.compile(r'jornada(\d+)')
+ROW_DATETIME = re.compile(r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})')
+ROW_SCORE = re.compile(r'(\d+)\s*[-:]\s*(\d+)')
+ROW_VENUE = re.compile(r'Estádio[^|<\n]+')
+
+# Text/markdown round pages (parse_text_content)
+TEXT_BLOCK_START = re.compile(r'(?=\|\s*\d{1,2}\s+\w{3}\s+\d{2}\s+\d{2}:\d{2})')
+TEXT_DATETIME_STATUS = re.compile(
+    r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})\s+(Finalizado|Sin comenzar|En juego)', re.IGNORECASE
+)
+TEXT_TEAM_LINK = re.compile(r'\[([^\]]+)\]\(/equipo/')
+TEXT_SCORE = re.compile(r'\[(\d+)-(\d+)\]')
+TEXT_MATCH_PATH = re.compile(r'/partido/([^)]+)')
+TEXT_VENUE = re.compile(r'Estádio[^\[\n|]+')
+
+# Only the match tables are materialized when parsing a round page
+MATCH_TABLES = SoupStrainer('table')
+
+# Every known stadium, for pages without a registry entry
+ALL_STADIUMS = {}
+for _competition in COMPETITIONS.values():
+    ALL_STADIUMS.update(_competition['stadiums'])
 
 
 # =============================================================================
@@ -39,9 +55,9 @@ def normalize_team_name(name: str) -> str:
     name = unicodedata.normalize('NFKD', name)
     name = name.encode('ASCII', 'ignore').decode('ASCII')
     name = name.lower().strip()
-    name = re.sub(r'[\s_]+', '-', name)
-    name = re.sub(r'[^a-z0-9-]', '', name)
-    name = re.sub(r'-+', '-', name)
+    name = SLUG_SEPARATORS.sub('-', name)
+    name = SLUG_INVALID.sub('', name)
+    name = SLUG_DASHES.sub('-', name)
     name = name.strip('-')
     return name
 
@@ -74,7 +90,7 @@ def parse_spanish_date(date_str: str, time_str: str) -> Optional[str]:
     return None
 
 
-def extract_stadium_info(stadium_name: str) -> Tuple[Optional[str], Optional[str]]:
+def extract_stadium_info(stadium_name: str, stadium_cities: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract stadium name and city from raw stadium text.
     """
@@ -82,14 +98,10 @@ def extract_stadium_info(stadium_name: str) -> Tuple[Optional[str], Optional[str
         return None, None
     
     stadium_name = stadium_name.strip()
-    stadium_name = re.sub(r'\s+', ' ', stadium_name)
+    stadium_name = WHITESPACE.sub(' ', stadium_name)
     
-    stadium_cities = {
-        'maracanã': 'Rio de Janeiro',
-        'engenhão': 'Rio de Janeiro',
-        'nilton santos': 'Rio de Janeiro',
-        'são januário': 'Rio de Janeiro',
-        }
+    if stadium_cities is None:
+        stadium_cities = ALL_STADIUMS
     
     name_lower = stadium_name.lower()
     city = None
@@ -136,54 +148,74 @@ def extract_teams_from_match_url(match_url: str) -> Tuple[Optional[str], Optiona
         return None, None
     
     # Pattern: /partido/home-team/away-team/numbers
-    match = re.search(r'/partido/([^/]+)/([^/]+)/\d+', match_url)
+    match = MATCH_URL_TEAMS.search(match_url)
     if match:
         return match.group(1), match.group(2)
     
     return None, None
 
-def extract_teams_from_match_url(match_url: str) -> Tuple[Optional[str], Optional[str]]:
+
+def competition_details(url: str, competition: Optional[Dict] = None) -> Tuple[str, Optional[str], Dict[str, str]]:
     """
-    Extract home and away team slugs from matchURL.
-    Format: /partido/HomeTeam/AwayTeam/YYYYDDSequencialNumber
+    Tournament id, venue state and stadium map for a round page.
     """
-    if not match_url:
-        return None, None
-    
-    # Pattern: /partido/team1/team2/number
-    match = re.search(r'/partido/([^/]+)/([^/]+)/\d+', match_url)
-    if match:
-        return match.group(1), match.group(2)
+    if competition is None:
+        competition = competition_for_url(url)
+    if competition:
+        return competition['tournament'], competition['state'], competition['stadiums']
     
-    return None, None
+    # Unknown competition: derive the id from the URL path (e.g. brasil26)
+    tournament = "unknown"
+    url_match = URL_TOURNAMENT.search(url)
+    if url_match:
+        tournament = f"{url_match.group(1)}{url_match.group(2)[-2:]}"
+    return tournament, None, ALL_STADIUMS
+
+
+def round_label(url: str, competition: Optional[Dict] = None) -> str:
+    """
+    Round name for a round page: the jornada in the URL, else the
+    competition's first round.
+    """
+    round_match = URL_ROUND.search(url.lower())
+    if round_match:
+        return f"Jornada {round_match.group(1)}"
+    if competition is None:
+        competition = competition_for_url(url)
+    first_round = competition['rounds'][0] if competition else 1
+    return f"Jornada {first_round}"
 
 
 # =============================================================================
 # HTML Parser
 # =============================================================================
 
-def parse_html_content(html: str, url: str) -> Dict:
+def parse_html_content(html: str, url: str, competition: Optional[Dict] = None,
+                       full_tree: bool = False) -> Dict:
     """
     Parse HTML content using BeautifulSoup.
+    
+    competition is a COMPETITIONS entry; when omitted it is looked up from
+    the URL, falling back to a tournament id derived from the URL path.
+    Only <table> elements are built into the tree unless full_tree is set
+    (same output, kept for benchmarking).
     """
-    soup = BeautifulSoup(html, 'lxml')
+    if full_tree:
+        soup = BeautifulSoup(html, 'lxml')
+    else:
+        soup = BeautifulSoup(html, 'lxml', parse_only=MATCH_TABLES)
     matches = []
-    tournament = "carioca26"
-    round_name = "Jornada 3"
     
-    url_match = re.search(r'/competicion/([^/]+)/(\d{4})', url)
-    if url_match:
-        tournament = f"{url_match.group(1)}{url_match.group(2)[-2:]}"
-                    
-    round_match = re.search(r'jornada(\d+)', url.lower())
-    if round_match:
-        round_name = f"Jornada {round_match.group(1)}"
+    tournament, state, stadiums = competition_details(url, competition)
+    round_name = round_label(url, competition)
     
     seen = set()
     
     for table in soup.find_all('table'):
         for row in table.find_all('tr'):
-            team_links = row.find_all('a', href=re.compile(r'/equipo/'))
+            # One pass over the row's links for both team and match links
+            links = row.find_all('a', href=True)
+            team_links = [link for link in links if '/equipo/' in link['href']]
             if len(team_links) < 2:
                 continue
             
@@ -198,20 +230,20 @@ def parse_html_content(html: str, url: str) -> Dict:
             row_text = row.get_text()
             
             # Extract date/time
-            dt_match = re.search(r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})', row_text)
+            dt_match = ROW_DATETIME.search(row_text)
             match_date = None
             if dt_match:
                 match_date = parse_spanish_date(dt_match.group(1), dt_match.group(2))
             
             # Extract score
-            score_link = row.find('a', href=re.compile(r'/partido/'))
+            score_link = next((link for link in links if '/partido/' in link['href']), None)
             score_home, score_away = None, None
             match_url = None
             
             if score_link:
                 match_url = score_link.get('href')
                 score_text = score_link.get_text(strip=True)
-                score_match = re.search(r'(\d+)\s*[-:]\s*(\d+)', score_text)
+                score_match = ROW_SCORE.search(score_text)
                 if score_match:
                     score_home = int(score_match.group(1))
                     score_away = int(score_match.group(2))
@@ -226,10 +258,10 @@ def parse_html_content(html: str, url: str) -> Dict:
             status = determine_status(row_text, score_home is not None)
             
             # Venue
-            venue_match = re.search(r'Estádio[^|<\n]+', row_text)
+            venue_match = ROW_VENUE.search(row_text)
             venue_name, venue_city = None, None
             if venue_match:
-                venue_name, venue_city = extract_stadium_info(venue_match.group(0))
+                venue_name, venue_city = extract_stadium_info(venue_match.group(0), stadiums)
             
             # Build match ID (without tournament prefix)
             date_for_id = "unknown"
@@ -247,7 +279,7 @@ def parse_html_content(html: str, url: str) -> Dict:
                 "round": round_name,
                 "status": status,
                 "score": {"home": score_home, "away": score_away},
-                "venue": {"name": venue_name, "city": venue_city, "state": "SP"},
+                "venue": {"name": venue_name, "city": venue_city, "state": state},
                 "broadcasting": [],
                 "matchURL": match_url
             }
@@ -261,33 +293,23 @@ def parse_html_content(html: str, url: str) -> Dict:
 # Text/Markdown Parser
 # =============================================================================
 
-def parse_text_content(content: str, url: str) -> Dict:
+def parse_text_content(content: str, url: str, competition: Optional[Dict] = None) -> Dict:
     """
     Parse text/markdown content (from web fetch tools).
     """
     matches = []
-    tournament = "carioca26"
-    round_name = "Jornada 3"
     
-    url_match = re.search(r'/competicion/([^/]+)/(\d{4})', url)
-    if url_match:
-        tournament = f"{url_match.group(1)}{url_match.group(2)[-2:]}"
-            
-    round_match = re.search(r'jornada(\d+)', url.lower())
-    if round_match:
-        round_name = f"Jornada {round_match.group(1)}"
+    tournament, state, stadiums = competition_details(url, competition)
+    round_name = round_label(url, competition)
     
     seen = set()
-    blocks = re.split(r'(?=\|\s*\d{1,2}\s+\w{3}\s+\d{2}\s+\d{2}:\d{2})', content)
+    blocks = TEXT_BLOCK_START.split(content)
     
     for block in blocks:
         if not block.strip():
             continue
         
-        dt_match = re.search(
-            r'(\d{1,2}\s+\w{3}\s+\d{2})\s+(\d{2}:\d{2})\s+(Finalizado|Sin comenzar|En juego)',
-            block, re.IGNORECASE
-        )
+        dt_match = TEXT_DATETIME_STATUS.search(block)
         if not dt_match:
             continue
         
@@ -295,7 +317,7 @@ def parse_text_content(content: str, url: str) -> Dict:
         time_str = dt_match.group(2)
         status_text = dt_match.group(3)
         
-        teams = re.findall(r'\[([^\]]+)\]\(/equipo/', block)
+        teams = TEXT_TEAM_LINK.findall(block)
         if len(teams) < 2:
             continue
         
@@ -309,13 +331,13 @@ def parse_text_content(content: str, url: str) -> Dict:
         
         match_date = parse_spanish_date(date_str, time_str)
         
-        score_match = re.search(r'\[(\d+)-(\d+)\]', block)
+        score_match = TEXT_SCORE.search(block)
         score_home = int(score_match.group(1)) if score_match else None
         score_away = int(score_match.group(2)) if score_match else None
         
         status = determine_status(status_text, score_home is not None)
         
-        url_match_result = re.search(r'/partido/([^)]+)', block)
+        url_match_result = TEXT_MATCH_PATH.search(block)
         match_url = f"/partido/{url_match_result.group(1)}" if url_match_result else None
         
         # Extract teams from matchURL (more reliable)
@@ -325,10 +347,10 @@ def parse_text_content(content: str, url: str) -> Dict:
         home_slug = url_home if url_home else normalize_team_name(home_team)
         away_slug = url_away if url_away else normalize_team_name(away_team)
         
-        venue_match = re.search(r'Estádio[^\[\n|]+', block)
+        venue_match = TEXT_VENUE.search(block)
         venue_name, venue_city = None, None
         if venue_match:
-            venue_name, venue_city = extract_stadium_info(venue_match.group(0))
+            venue_name, venue_city = extract_stadium_info(venue_match.group(0), stadiums)
         
         # Build match ID (without tournament prefix)
         date_for_id = "unknown"
@@ -346,7 +368,7 @@ def parse_text_content(content: str, url: str) -> Dict:
             "round": round_name,
             "status": status,
             "score": {"home": score_home, "away": score_away},
-            "venue": {"name": venue_name, "city": venue_city, "state": "SP"},
+            "venue": {"name": venue_name, "city": venue_city, "state": state},
             "broadcasting": [],
             "matchURL": match_url
         }
@@ -354,59 +376,3 @@ def parse_text_content(content: str, url: str) -> Dict:
         matches.append(match_data)
     
     return {"matches": matches}
-
-
-# =============================================================================
-# URL Fetcher
-# =============================================================================
-
-def fetch_and_parse(url: str) -> Dict:
-    """
-    Fetch URL and parse content.
-    """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'text/html,application/xhtml+xml',
-        'Accept-Language': 'en-US,en;q=0.5',
-    }
-    
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    
-    return parse_html_content(response.text, url)
-
-
-# =============================================================================
-# Main Entry Point
-# =============================================================================
-
-def main():
-    from datetime import datetime
-    
-    print(f"Scraping: {target_url}")
-    print("-" * 60)
-    
-    try:
-        result = fetch_and_parse(target_url)
-    except Exception as e:
-        print(f"Error fetching URL: {e}")
-        return None
-    
-    output_json = json.dumps(result, indent=2, ensure_ascii=False)
-        
-    # Save to file with datetime filename
-    timestamp = datetime.now().strftime("%d%m%Y-%H%M%S")
-    filename = f"resultados/{timestamp}_resultados.json"
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(output_json)
-    
-    print("-" * 60)
-    print(f"Total matches: {len(result.get('matches', []))}")
-    print(f"Saved to: {filename}")
-    
-    return result
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Diff-only scraper output.
+
+Instead of a full timestamped snapshot per run, the last known state of
+every match is kept and each run appends only new or changed matches to
+resultados/changes.jsonl, one compact JSON change record per line:
+
+    {"op": "new", "id": ..., "fields": [...], "at": ..., "match": {...}}
+    {"op": "update", "id": ..., "previousId": ..., "fields": [...], ...}
+
+previousId is set when a match was rescheduled (its id embeds the date).
+Every COMPACT_EVERY records the log is folded into
+resultados/current_resultados.json (same {"matches": [...]} layout as a
+snapshot) and truncated.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+BASE_DIR = Path(__file__).parent.parent.parent
+RESULTADOS_DIR = BASE_DIR / "resultados"
+STATE_FILE = RESULTADOS_DIR / "current_resultados.json"
+CHANGES_FILE = RESULTADOS_DIR / "changes.jsonl"
+
+# Fields whose changes are recorded
+TRACKED_FIELDS = ("score", "status", "matchDate", "venue")
+
+# Change records kept in the log before it is folded into STATE_FILE
+COMPACT_EVERY = 1000
+
+
+def fixture_key(match: Dict) -> Tuple:
+    """Identifies a fixture across reschedules (the id embeds the date)."""
+    return match.get("tournament"), match.get("homeTeam"), match.get("awayTeam"), match.get("round")
+
+
+def read_changes(path: Path = CHANGES_FILE, offset: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """Yield (record, end_offset) for each complete line from offset on.
+
+    A trailing line without a newline (a write in progress) is left for
+    the next reader.
+    """
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+
+
+def load_state() -> Tuple[Dict[str, Dict], int]:
+    """Last known state {match id: match} and the number of logged changes."""
+    state = {}
+    if STATE_FILE.exists():
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            for match in json.load(f).get("matches", []):
+                state[match["id"]] = match
+
+    logged = 0
+    for record, _ in read_changes():
+        apply_change(state, record)
+        logged += 1
+    return state, logged
+
+
+def apply_change(state: Dict[str, Dict], record: Dict):
+    if record.get("previousId"):
+        state.pop(record["previousId"], None)
+    state[record["id"]] = record["match"]
+
+
+def diff_matches(state: Dict[str, Dict], matches: List[Dict]) -> List[Dict]:
+    """Change records for the scraped matches that are new or changed."""
+    by_fixture = {fixture_key(match): match_id for match_id, match in state.items()}
+    now = datetime.now(timezone.utc).isoformat()
+    records = []
+
+    for match in matches:
+        previous = state.get(match["id"])
+        record = {"op": "update", "id": match["id"]}
+
+        if previous is None:
+            previous_id = by_fixture.get(fixture_key(match))
+            if previous_id and previous_id != match["id"]:
+                previous = state[previous_id]
+                record["previousId"] = previous_id
+            else:
+                record["op"] = "new"
+
+        if previous is None:
+            fields = list(TRACKED_FIELDS)
+        else:
+            fields = [field for field in TRACKED_FIELDS if match.get(field) != previous.get(field)]
+            if not fields:
+                continue
+
+        record["fields"] = fields
+        record["at"] = now
+        record["match"] = match
+        records.append(record)
+        apply_change(state, record)
+        by_fixture[fixture_key(match)] = match["id"]
+
+    return records
+
+
+def append_changes(records: List[Dict]):
+    RESULTADOS_DIR.mkdir(exist_ok=True)
+    with open(CHANGES_FILE, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def compact(state: Dict[str, Dict]):
+    """Write the current state file, then empty the change log.
+
+    If interrupted in between, replaying the log over the new state is
+    harmless (records carry whole matches).
+    """
+    RESULTADOS_DIR.mkdir(exist_ok=True)
+    tmp_path = STATE_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"compactedAt": datetime.now(timezone.utc).isoformat(),
+                   "matches": [state[match_id] for match_id in sorted(state)]},
+                  f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, STATE_FILE)
+    if CHANGES_FILE.exists():
+        CHANGES_FILE.unlink()
+
+
+def record_scrape(matches: List[Dict], force_compact: bool = False) -> Tuple[int, bool]:
+    """Append change records for a scrape; returns (records written, compacted)."""
+    state, logged = load_state()
+    records = diff_matches(state, matches)
+    if records:
+        append_changes(records)
+
+    if force_compact or logged + len(records) >= COMPACT_EVERY:
+        compact(state)
+        return len(records), True
+    return len(records), False
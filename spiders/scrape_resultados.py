@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Match Results Scraper
+=====================
+
+Scrapes Brasileirão, Paulistão and Carioca round pages from
+resultados-futbol.com into resultados/<timestamp>_resultados.json, which
+update_scores.py then applies to Firestore.
+
+Dependencies:
+    pip install requests beautifulsoup4 lxml
+
+Usage:
+    python spiders/scrape_resultados.py
+    python spiders/scrape_resultados.py --competitions paulistao carioca --rounds 5
+    python spiders/scrape_resultados.py --competitions brasileirao --rounds 1-38
+"""
+
+from resultados_scraper.engine import main
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,18 @@ Team Historical Data Scraper
 Scrapes Wikipedia team pages to extract historical details, statistics, and information
 """
 
-import requests
 from bs4 import BeautifulSoup
 from pathlib import Path
 import re
+import os
 import json
+import argparse
+import asyncio
+import html
+from datetime import datetime, timezone
+from urllib.parse import unquote, urlencode, urlsplit
+from http_cache import HTTPCache
+from resultados_scraper.fetcher import AsyncFetcher
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
@@ -16,6 +23,56 @@ TIMES_DIR = BASE_DIR / 'times'
 DATA_DIR = BASE_DIR / 'data'
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+TEAMS_DATA_FILE = DATA_DIR / 'teams_data.json'
+
+# Work queue of the current run and its append-only results log; both are
+# removed once the run completes and the log is folded into TEAMS_DATA_FILE
+QUEUE_FILE = DATA_DIR / 'teams_data_queue.json'
+RESULTS_LOG = DATA_DIR / 'teams_data_results.jsonl'
+
+# Wikipedia pages are cached on disk and revalidated on reruns
+http_cache = HTTPCache()
+
+# Wikipedia politeness, shared by all workers: pages fetched at once and
+# requests per second (cache hits are not limited)
+WIKI_CONCURRENCY = 4
+WIKI_RATE = 2.0
+
+# MediaWiki API retrieval: articles per query (the API's limit for titles)
+API_PATH = '/w/api.php'
+API_BATCH_SIZE = 50
+
+# Infobox labels per field: rendered row headers (matched anywhere in the
+# header) or wikitext parameter names (matched as a prefix, so e.g.
+# "imagem_estádio" is not taken for the stadium)
+INFOBOX_FIELDS = [
+    ('founded', ('fundado', 'fundacao', 'fundação')),
+    ('stadium', ('estadio', 'estádio')),
+    ('capacity', ('capacidade',)),
+    ('nickname', ('alcunha', 'apelido')),
+    ('colors', ('cores',)),
+]
+
+def infobox_field(label, prefix=False):
+    """Field an infobox label maps to, or None"""
+    for field, keys in INFOBOX_FIELDS:
+        if any(label.startswith(key) if prefix else key in label for key in keys):
+            return field
+    return None
+
+def empty_team_data(team_name, wiki_url):
+    return {
+        'name': team_name,
+        'wiki_url': wiki_url,
+        'founded': None,
+        'stadium': None,
+        'capacity': None,
+        'nickname': None,
+        'colors': None,
+        'titles': [],
+        'description': None
+    }
+
 def extract_wiki_url_from_page(html_file):
     """Extract Wikipedia URL from HTML comment in team page"""
     try:
@@ -31,162 +88,439 @@ def extract_wiki_url_from_page(html_file):
         print("[ERROR] Failed to extract URL from " + html_file.name + ": " + str(e))
         return None
 
+def parse_team_details(content, wiki_url, team_name):
+    """Extract the infobox fields and lead paragraph from a team's article"""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    team_data = empty_team_data(team_name, wiki_url)
+
+    # Look for infobox (common in Wikipedia team pages)
+    infobox = soup.find('table', {'class': 'infobox'})
+
+    if infobox:
+        rows = infobox.find_all('tr')
+        for row in rows:
+            header = row.find('th')
+            data = row.find('td')
+
+            if header and data:
+                header_text = header.get_text(strip=True).lower()
+                field = infobox_field(header_text)
+                if field:
+                    team_data[field] = data.get_text(strip=True)
+
+    # Extract first paragraph as description
+    first_para = soup.find('p', {'class': None})
+    if first_para:
+        description = first_para.get_text(strip=True)
+        if len(description) > 50:  # Only if substantial
+            team_data['description'] = description[:500]  # Limit to 500 chars
+
+    print("[OK] Scraped: " + team_name)
+    return team_data
+
 def scrape_team_details(wiki_url, team_name):
     """Scrape team historical details from Wikipedia"""
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(wiki_url, headers=headers, timeout=15)
+        response = http_cache.get(wiki_url, headers=headers, timeout=15)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        team_data = {
-            'name': team_name,
-            'wiki_url': wiki_url,
-            'founded': None,
-            'stadium': None,
-            'capacity': None,
-            'nickname': None,
-            'colors': None,
-            'titles': [],
-            'description': None
-        }
-        
-        # Look for infobox (common in Wikipedia team pages)
-        infobox = soup.find('table', {'class': 'infobox'})
-        
-        if infobox:
-            rows = infobox.find_all('tr')
-            for row in rows:
-                header = row.find('th')
-                data = row.find('td')
-                
-                if header and data:
-                    header_text = header.get_text(strip=True).lower()
-                    data_text = data.get_text(strip=True)
-                    
-                    # Extract founded date
-                    if 'fundado' in header_text or 'fundacao' in header_text or 'fundação' in header_text:
-                        team_data['founded'] = data_text
-                    
-                    # Extract stadium
-                    elif 'estadio' in header_text or 'estádio' in header_text:
-                        team_data['stadium'] = data_text
-                    
-                    # Extract capacity
-                    elif 'capacidade' in header_text:
-                        team_data['capacity'] = data_text
-                    
-                    # Extract nickname
-                    elif 'alcunha' in header_text or 'apelido' in header_text:
-                        team_data['nickname'] = data_text
-                    
-                    # Extract colors
-                    elif 'cores' in header_text:
-                        team_data['colors'] = data_text
-        
-        # Extract first paragraph as description
-        first_para = soup.find('p', {'class': None})
-        if first_para:
-            description = first_para.get_text(strip=True)
-            if len(description) > 50:  # Only if substantial
-                team_data['description'] = description[:500]  # Limit to 500 chars
-        
-        print("[OK] Scraped: " + team_name)
-        return team_data
+        return parse_team_details(response.content, wiki_url, team_name)
         
     except Exception as e:
         print("[ERROR] Failed to scrape " + team_name + ": " + str(e))
         return None
 
-def scrape_all_teams():
-    """Scrape historical details for all teams"""
+# =============================================================================
+# MediaWiki API retrieval
+# =============================================================================
+# Instead of one full article per team, one API query returns the lead
+# section wikitext (infobox included) and the plain-text intro of up to
+# API_BATCH_SIZE articles.
+
+WIKI_COMMENT = re.compile(r'<!--.*?-->', re.S)
+WIKI_REF = re.compile(r'<ref[^>]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+WIKI_BREAK = re.compile(r'<br\s*/?>', re.I)
+WIKI_TAG = re.compile(r'</?\w[^>]*>')
+WIKI_TEMPLATE = re.compile(r'\{\{([^{}]*)\}\}')
+WIKI_LINK = re.compile(r'\[\[([^\[\]]*)\]\]')
+WIKI_EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//\S+\s*([^\]]*)\]')
+INFOBOX_START = re.compile(r'\{\{\s*Info', re.I)
+
+# Links to these namespaces are images or categories, not text
+WIKI_MEDIA_PREFIXES = ('ficheiro:', 'arquivo:', 'imagem:', 'file:', 'image:', 'categoria:', 'category:')
+
+# Templates that only format their first argument, and date templates
+# taking day|month|year
+WIKI_TEXT_TEMPLATES = {'formatnum', 'nowrap', 'nobr', 'small', 'smaller', 'lang', 'nome'}
+WIKI_DATE_TEMPLATES = {'dni', 'dtlink', 'data', 'data de início', 'data de fundação', 'idade'}
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho',
+         'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+def wiki_title(wiki_url):
+    """Article title of a /wiki/ URL"""
+    path = urlsplit(wiki_url).path
+    if '/wiki/' not in path:
+        raise ValueError("not a Wikipedia article URL: " + wiki_url)
+    return unquote(path.split('/wiki/', 1)[1]).replace('_', ' ')
+
+def api_query_url(wiki_url, titles, continuation=None):
+    """API query for the lead wikitext and intro extract of titles, on wiki_url's wiki"""
+    parts = urlsplit(wiki_url)
+    params = {
+        'action': 'query',
+        'format': 'json',
+        'formatversion': '2',
+        'redirects': '1',
+        'prop': 'revisions|extracts',
+        'rvprop': 'content',
+        'rvslots': 'main',
+        'rvsection': '0',
+        'exintro': '1',
+        'explaintext': '1',
+        'exlimit': 'max',
+        'titles': '|'.join(titles),
+    }
+    params.update(continuation or {})
+    return f"{parts.scheme}://{parts.netloc}{API_PATH}?{urlencode(params)}"
+
+def api_batches(jobs):
+    """Jobs grouped per wiki, API_BATCH_SIZE at a time"""
+    wikis = {}
+    for job in jobs:
+        wikis.setdefault(urlsplit(job['wiki_url']).netloc, []).append(job)
+    for wiki_jobs in wikis.values():
+        for i in range(0, len(wiki_jobs), API_BATCH_SIZE):
+            yield wiki_jobs[i:i + API_BATCH_SIZE]
+
+async def fetch_api_pages(fetcher, wiki_urls):
+    """{wiki_url: page} for articles of one wiki (at most API_BATCH_SIZE).
+
+    Follows the API's continuations (extracts come at most 20 per response)
+    and resolves normalized titles and redirects; page is None for missing
+    articles.
+    """
+    titles = {wiki_url: wiki_title(wiki_url) for wiki_url in wiki_urls}
+    pages = {}
+    aliases = {}
+    continuation = None
+    while True:
+        url = api_query_url(wiki_urls[0], list(dict.fromkeys(titles.values())), continuation)
+        data = json.loads(await fetcher.fetch(url))
+        if 'error' in data:
+            raise ValueError(data['error'].get('info', 'MediaWiki API error'))
+        query = data.get('query', {})
+        for alias in query.get('normalized', []) + query.get('redirects', []):
+            aliases[alias['from']] = alias['to']
+        # Later responses carry the parts (extracts) the earlier ones left out
+        for page in query.get('pages', []):
+            pages.setdefault(page['title'], {}).update(page)
+        if 'continue' not in data:
+            break
+        continuation = data['continue']
+
+    found = {}
+    for wiki_url, title in titles.items():
+        seen = set()
+        while title in aliases and title not in seen:
+            seen.add(title)
+            title = aliases[title]
+        page = pages.get(title)
+        found[wiki_url] = None if not page or page.get('missing') or page.get('invalid') else page
+    return found
+
+def split_top_level(text, sep='|'):
+    """Split text on sep outside {{templates}} and [[links]]"""
+    parts = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(text):
+        pair = text[i:i + 2]
+        if pair in ('{{', '[['):
+            depth += 1
+            i += 2
+        elif pair in ('}}', ']]'):
+            depth -= 1
+            i += 2
+        else:
+            if text[i] == sep and depth == 0:
+                parts.append(text[start:i])
+                start = i + 1
+            i += 1
+    parts.append(text[start:])
+    return parts
+
+def infobox_source(wikitext):
+    """Inside of the first {{Info...}} template in wikitext, or None"""
+    match = INFOBOX_START.search(wikitext)
+    if not match:
+        return None
+    depth = 0
+    i = match.start()
+    while i < len(wikitext):
+        pair = wikitext[i:i + 2]
+        if pair == '{{':
+            depth += 1
+            i += 2
+        elif pair == '}}':
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return wikitext[match.start() + 2:i - 2]
+        else:
+            i += 1
+    return None
+
+def expand_template(source):
+    """Text of a simple inline template; other templates are dropped"""
+    name, *args = split_top_level(source)
+    # Parser functions take their first argument after a colon: {{formatnum:1234}}
+    name, colon, first = name.partition(':')
+    if colon:
+        args.insert(0, first)
+    name = name.strip().lower()
+    positional = [arg.strip() for arg in args if '=' not in arg]
+    if name in WIKI_TEXT_TEMPLATES and positional:
+        return positional[-1] if name in ('lang', 'nome') else positional[0]
+    if name in WIKI_DATE_TEMPLATES and len(positional) >= 3 and all(arg.isdigit() for arg in positional[:3]):
+        day, month, year = (int(arg) for arg in positional[:3])
+        if 1 <= month <= 12:
+            return f"{day} de {MESES[month - 1]} de {year}"
+    return ''
+
+def link_text(match):
+    target, _, label = match.group(1).partition('|')
+    if target.strip().lower().startswith(WIKI_MEDIA_PREFIXES):
+        return ''
+    return (label or target).rpartition('|')[2]
+
+def clean_wikitext(value):
+    """Plain text of an infobox value"""
+    value = WIKI_BREAK.sub(', ', value)
+    while True:
+        value, count = WIKI_TEMPLATE.subn(lambda m: expand_template(m.group(1)), value)
+        if not count:
+            break
+    value = WIKI_LINK.sub(link_text, value)
+    value = WIKI_EXTERNAL_LINK.sub(r'\1', value)
+    value = WIKI_TAG.sub('', value)
+    value = html.unescape(value.replace("'''", '').replace("''", ''))
+    return ' '.join(value.split()).strip(' ,;')
+
+def parse_api_page(page, wiki_url, team_name):
+    """Extract the infobox fields and lead paragraph from an API page
+    (lead section wikitext plus plain-text intro)"""
+    team_data = empty_team_data(team_name, wiki_url)
+
+    revisions = page.get('revisions') or [{}]
+    wikitext = revisions[0].get('slots', {}).get('main', {}).get('content', '')
+    infobox = infobox_source(WIKI_REF.sub('', WIKI_COMMENT.sub('', wikitext)))
+
+    if infobox:
+        for param in split_top_level(infobox)[1:]:
+            name, sep, value = param.partition('=')
+            field = infobox_field(name.strip().lower(), prefix=True) if sep else None
+            value = clean_wikitext(value) if field else ''
+            if value:
+                team_data[field] = value
+
+    # First paragraph of the intro as description
+    lead = next((line.strip() for line in page.get('extract', '').splitlines() if line.strip()), '')
+    if len(lead) > 50:  # Only if substantial
+        team_data['description'] = lead[:500]  # Limit to 500 chars
+
+    print("[OK] Scraped: " + team_name)
+    return team_data
+
+def parse_api_pages(pages, jobs):
+    """(job, team_data, error) for each job of a fetched batch"""
+    scraped = []
+    for job in jobs:
+        page = pages[job['wiki_url']]
+        if page is None:
+            print("[ERROR] Failed to scrape " + job['name'] + ": article not found")
+            scraped.append((job, None, 'article not found'))
+        else:
+            scraped.append((job, parse_api_page(page, job['wiki_url'], job['name']), None))
+    return scraped
+
+async def scrape_api_jobs(jobs, on_result, concurrency=WIKI_CONCURRENCY, rate=WIKI_RATE):
+    """Like scrape_jobs, with API_BATCH_SIZE teams per MediaWiki API query"""
+    fetcher = AsyncFetcher(concurrency=concurrency, rate=rate, cache=http_cache)
+
+    async def scrape(batch):
+        try:
+            pages = await fetch_api_pages(fetcher, [job['wiki_url'] for job in batch])
+            return await asyncio.to_thread(parse_api_pages, pages, batch)
+        except Exception as e:
+            print(f"[ERROR] Failed to query {len(batch)} teams: {e}")
+            return [(job, None, str(e)) for job in batch]
+
+    for scraped in asyncio.as_completed([scrape(batch) for batch in api_batches(jobs)]):
+        for result in await scraped:
+            on_result(*result)
+
+def load_teams_data():
+    """Teams collected so far ({slug: data}), or {} if there are none"""
+    if not TEAMS_DATA_FILE.exists():
+        return {}
+    try:
+        with open(TEAMS_DATA_FILE, 'r', encoding='utf-8') as f:
+            all_team_data = json.load(f)
+        print("[INFO] Loaded " + str(len(all_team_data)) + " teams from existing database")
+        return all_team_data
+    except (OSError, ValueError):
+        print("[WARN] Could not load existing database, starting fresh")
+        return {}
+
+def build_queue(all_team_data):
+    """Jobs ({slug, name, wiki_url}) for the team pages without details yet"""
+    team_files = sorted(f for f in TIMES_DIR.glob("*.html") if f.name != 'index.html')
+    print("[INFO] Found " + str(len(team_files)) + " team pages")
+    
+    jobs = []
+    for team_file in team_files:
+        team_slug = team_file.stem
+        team_name = team_slug.replace('-', ' ').title()
+        known = all_team_data.get(team_slug, {})
+        
+        # Skip if we already have detailed data (check for a specific field like 'founded')
+        if known.get('founded'):
+            continue
+        
+        # Wikipedia URL from the page, else from the loaded data
+        wiki_url = extract_wiki_url_from_page(team_file) or known.get('wiki_url')
+        if not wiki_url:
+            print("  [SKIP] No Wikipedia URL found for " + team_name)
+            continue
+        jobs.append({'slug': team_slug, 'name': team_name, 'wiki_url': wiki_url})
+    return jobs
+
+def save_queue(jobs):
+    tmp_path = QUEUE_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'createdAt': datetime.now(timezone.utc).isoformat(), 'jobs': jobs}, f, ensure_ascii=False)
+    os.replace(tmp_path, QUEUE_FILE)
+
+def load_queue():
+    """Jobs of an interrupted run, or None"""
+    if not QUEUE_FILE.exists():
+        return None
+    with open(QUEUE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)['jobs']
+
+def read_results_log():
+    """{slug: result record} from the results log; a torn last line is ignored"""
+    results = {}
+    if not RESULTS_LOG.exists():
+        return results
+    with open(RESULTS_LOG, 'rb') as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            record = json.loads(line)
+            results[record['slug']] = record
+    return results
+
+def compact(all_team_data, results):
+    """Fold the logged results into teams_data.json (one atomic rewrite)"""
+    for slug in sorted(results):
+        if results[slug].get('data'):
+            all_team_data.setdefault(slug, {}).update(results[slug]['data'])
+    tmp_path = TEAMS_DATA_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(all_team_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, TEAMS_DATA_FILE)
+
+async def scrape_jobs(jobs, on_result, concurrency=WIKI_CONCURRENCY, rate=WIKI_RATE):
+    """Scrape every job under the shared Wikipedia limits, calling
+    on_result(job, team_data, error) as each team finishes"""
+    fetcher = AsyncFetcher(concurrency=concurrency, rate=rate, cache=http_cache)
+
+    async def scrape(job):
+        try:
+            content = await fetcher.fetch(job['wiki_url'])
+            team_data = await asyncio.to_thread(parse_team_details, content, job['wiki_url'], job['name'])
+            return job, team_data, None
+        except Exception as e:
+            print("[ERROR] Failed to scrape " + job['name'] + ": " + str(e))
+            return job, None, str(e)
+
+    for scraped in asyncio.as_completed([scrape(job) for job in jobs]):
+        on_result(*(await scraped))
+
+def scrape_all_teams(concurrency=WIKI_CONCURRENCY, rate=WIKI_RATE, restart=False, source='api'):
+    """Scrape historical details for all teams.
+
+    The teams to scrape are written to a queue file first and every result
+    is appended to a log as it comes in, so an interrupted run picks up
+    exactly where it stopped; the log is folded into teams_data.json at the
+    end. restart discards an interrupted run's queue and log.
+
+    source 'api' queries the MediaWiki API in batches of API_BATCH_SIZE
+    teams; 'html' downloads and parses each full article.
+    """
     print("=" * 60)
     print("TEAM HISTORICAL DATA SCRAPER")
     print("=" * 60)
     print()
     
-    # Try to load existing data
-    json_path = DATA_DIR / 'teams_data.json'
-    all_team_data = {}
-    if json_path.exists():
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                all_team_data = json.load(f)
-            print("[INFO] Loaded " + str(len(all_team_data)) + " teams from existing database")
-        except:
-            print("[WARN] Could not load existing database, starting fresh")
+    all_team_data = load_teams_data()
     
-    success_count = 0
-    fail_count = 0
+    if restart:
+        QUEUE_FILE.unlink(missing_ok=True)
+        RESULTS_LOG.unlink(missing_ok=True)
     
-    # Get all team HTML files
-    team_files = list(TIMES_DIR.glob("*.html"))
-    team_files = [f for f in team_files if f.name != 'index.html']
+    jobs = load_queue()
+    results = read_results_log()
+    if jobs is None:
+        jobs = build_queue(all_team_data)
+        RESULTS_LOG.unlink(missing_ok=True)
+        results = {}
+        save_queue(jobs)
+    else:
+        print(f"[INFO] Resuming interrupted run: {len(results)}/{len(jobs)} teams already done")
     
-    print("[INFO] Found " + str(len(team_files)) + " team pages")
+    remaining = [job for job in jobs if job['slug'] not in results]
+    print(f"[INFO] {len(remaining)} teams to scrape")
     print()
     
+    success_count = 0
+    fail_count = 0
+    
+    completed = False
     try:
-        for i, team_file in enumerate(team_files):
-            team_slug = team_file.stem
-            team_name = team_slug.replace('-', ' ').title()
-            
-            # Skip if we already have detailed data (check for a specific field like 'founded')
-            if team_slug in all_team_data and 'founded' in all_team_data[team_slug] and all_team_data[team_slug]['founded']:
-                print("[SKIP] Already have data for: " + team_name)
-                continue
-            
-            print(f"[{i+1}/{len(team_files)}] Processing {team_name}...")
-            
-            # Extract Wikipedia URL from HTML
-            wiki_url = extract_wiki_url_from_page(team_file)
-            
-            if not wiki_url:
-                # Try to get from loaded data if available
-                if team_slug in all_team_data and 'wiki_url' in all_team_data[team_slug]:
-                    wiki_url = all_team_data[team_slug]['wiki_url']
-                
-                if not wiki_url:
-                    print("  [SKIP] No Wikipedia URL found")
+        with open(RESULTS_LOG, 'a', encoding='utf-8') as log:
+            def on_result(job, team_data, error):
+                nonlocal success_count, fail_count
+                record = {'slug': job['slug'], 'data': team_data, 'error': error}
+                log.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+                log.flush()
+                results[job['slug']] = record
+                if team_data:
+                    success_count += 1
+                else:
                     fail_count += 1
-                    continue
-            
-            # Scrape team details
-            team_data = scrape_team_details(wiki_url, team_name)
-            
-            if team_data:
-                # Merge with existing data
-                if team_slug not in all_team_data:
-                    all_team_data[team_slug] = {}
-                all_team_data[team_slug].update(team_data)
-                success_count += 1
-                
-                # Save progress every 5 teams
-                if success_count % 5 == 0:
-                    with open(json_path, 'w', encoding='utf-8') as f:
-                        json.dump(all_team_data, f, ensure_ascii=False, indent=2)
-                    print("  [SAVE] Progress saved")
-            else:
-                fail_count += 1
-            
-            # Be nice to Wikipedia - Variable delay
-            import time
-            import random
-            time.sleep(random.uniform(2.0, 4.0))
             
+            scrape = scrape_api_jobs if source == 'api' else scrape_jobs
+            asyncio.run(scrape(remaining, on_result, concurrency, rate))
+        completed = True
     except KeyboardInterrupt:
-        print("\n[WARN] Operations interrupted! Saving progress...")
+        print("\n[WARN] Operations interrupted! Rerun to resume; saving progress...")
     
     # Final Save
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(all_team_data, f, ensure_ascii=False, indent=2)
+    compact(all_team_data, results)
+    if completed:
+        QUEUE_FILE.unlink(missing_ok=True)
+        RESULTS_LOG.unlink(missing_ok=True)
     
     print()
     print("=" * 60)
-    print("[SUCCESS] Scraping session complete!")
-    print("[STATS] Newly Scraped: " + str(success_count) + " teams")
-    print("[INFO] Data saved to: " + str(json_path))
+    print("[SUCCESS] Scraping session complete!" if completed else "[WARN] Scraping session interrupted")
+    print("[STATS] Newly Scraped: " + str(success_count) + " teams, " + str(fail_count) + " failed")
+    print("[INFO] Data saved to: " + str(TEAMS_DATA_FILE))
+    print("[INFO] " + http_cache.summary())
     print("=" * 60)
     
     return all_team_data
@@ -212,8 +546,20 @@ def generate_summary_report(teams_data):
     print("\n[OK] Summary report saved to: " + str(report_file))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape team details from Wikipedia")
+    parser.add_argument('--concurrency', type=int, default=WIKI_CONCURRENCY,
+                        help=f"Wikipedia pages fetched at once (default: {WIKI_CONCURRENCY})")
+    parser.add_argument('--rate', type=float, default=WIKI_RATE,
+                        help=f"Wikipedia requests per second (default: {WIKI_RATE})")
+    parser.add_argument('--restart', action='store_true',
+                        help="Discard an interrupted run instead of resuming it")
+    parser.add_argument('--source', choices=['api', 'html'], default='api',
+                        help=f"'api': lead sections from the MediaWiki API, {API_BATCH_SIZE} teams "
+                             "per request; 'html': full article pages (default: api)")
+    args = parser.parse_args()
+
     try:
-        teams_data = scrape_all_teams()
+        teams_data = scrape_all_teams(args.concurrency, args.rate, args.restart, args.source)
         
         if teams_data:
             generate_summary_report(teams_data)
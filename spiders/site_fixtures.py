@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic Site Pages
+Offline stand-ins for the pages the spiders scrape, built from data/*.json
+in the markup the parsers read and padded like the real pages: Wikipedia
+league pages and team articles (HTML and MediaWiki API form) and
+resultados-futbol.com round pages. Served through fixture_server.py by
+bench_scrapers.py, emulator_harness.py and check_live_scores.py.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+MESES_ES = ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sep', 'oct', 'nov', 'dic']
+STATUS_TEXT = {'finished': 'Finalizado', 'live': 'En juego'}
+
+
+def load_data(name, key):
+    with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+        return json.load(f)[key]
+
+
+def page_filler(sections):
+    """Navigation, links and prose the scrapers have to skip"""
+    links = "".join(f'<li><a href="/nav/{j}">Link {j}</a></li>' for j in range(12))
+    return "".join(
+        f'<div class="nav"><ul>{links}</ul></div>'
+        f'<p class="text">Secção {i}: texto corrido de exemplo com <a href="/wiki/Ref_{i}">ligações</a> e notas.</p>'
+        for i in range(sections)
+    )
+
+
+def match_row(match):
+    kickoff = datetime.fromisoformat(match['matchDate'])
+    when = f"{kickoff.day} {MESES_ES[kickoff.month - 1]} {kickoff:%y} {kickoff:%H:%M}"
+    home, away = match['homeTeam'], match['awayTeam']
+    score = match.get('score') or {}
+    finished = score.get('home') is not None and score.get('away') is not None
+    result = f"{score['home']}-{score['away']}" if finished else "x"
+    status = STATUS_TEXT.get(match.get('status'), 'Sin comenzar')
+    venue = (match.get('venue') or {}).get('name') or ''
+    return (f'<tr><td class="fecha">{when}</td>'
+            f'<td class="equipo1"><a href="/equipo/{home}">{home}</a></td>'
+            f'<td class="rstd"><a href="/partido/{home}/{away}/{kickoff:%Y%m%d}">{result}</a></td>'
+            f'<td class="equipo2"><a href="/equipo/{away}">{away}</a></td>'
+            f'<td class="estado">{status}</td><td class="estadio">Estádio {venue}</td></tr>')
+
+
+def round_page(matches):
+    rows = "".join(match_row(match) for match in matches)
+    return (f'<html><head><title>Jornada</title></head><body>{page_filler(40)}'
+            f'<table class="tablaresultados">{rows}</table>{page_filler(40)}</body></html>')
+
+
+def team_article(team):
+    """(article HTML, API article) for a team of data/teams.json"""
+    name = team['name']
+    stadium = team.get('stadium') or ''
+    founded = team.get('founded') or ''
+    lead = (f"{name} é um clube de futebol brasileiro, fundado em {founded}, "
+            f"que manda os seus jogos no Estádio {stadium}.")
+    html = (f'<html><body>{page_filler(20)}<table class="infobox">'
+            f'<tr><th>Fundado em</th><td>{founded}</td></tr>'
+            f'<tr><th>Estádio</th><td><a href="/wiki/Estadio">{stadium}</a></td></tr>'
+            f'<tr><th>Alcunha</th><td>{name}</td></tr></table>'
+            f'<p>{lead}</p>{page_filler(300)}</body></html>')
+    wikitext = (
+        "{{Info/Futebol/clube\n"
+        f"| nome = {name}\n"
+        f"| fundadoem = [[{founded}]]\n"
+        f"| estádio = [[Estadio|{stadium}]]<ref>{{{{citar web|url=https://example.org}}}}</ref>\n"
+        f"| alcunha = {name}\n"
+        "}}\n"
+        f"'''{name}''' é um clube de futebol brasileiro."
+    )
+    return html, {'wikitext': wikitext, 'extract': lead}
+
+
+def league_pages(campeonatos):
+    """Minimal Wikipedia league pages listing the teams of data/teams.json"""
+    teams = load_data('teams.json', 'teams')
+    tournaments = {'paulistao': 'paulistao', 'carioca': 'carioca', 'brasileirao': 'brasileiro'}
+
+    pages = {}
+    for league, url in campeonatos.items():
+        prefix = tournaments.get(league)
+        rows = "".join(
+            f'<tr><td><a href="/wiki/{team["name"].replace(" ", "_")}" title="{team["name"]} Futebol Clube">'
+            f'{team["name"]}</a></td></tr>'
+            for team in teams
+            if prefix and any(t.startswith(prefix) for t in team.get('tournaments', []))
+        )
+        body = f'<html><body><table class="wikitable">{rows}</table></body></html>'
+        pages[url] = ('text/html; charset=utf-8', body.encode('utf-8'))
+    return pages
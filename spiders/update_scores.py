@@ -3,23 +3,54 @@
 Update Match Scores
 Reads matches.json and updates null scores using data from resultados files.
 Only updates scores for matches with status "finished" in resultados.
+Change records from scrape_resultados.py --diff (resultados/changes.jsonl)
+are read incrementally: each run only parses the lines added since the last.
 
 Run daily at 05:00 AM via Windows Task Scheduler.
+
+Live mode (--live) keeps running on match days: it polls the
+resultados-futbol.com round pages of today's scheduled/live matches every
+minute while a match is in its window (15 min before kickoff to 150 min
+after), sleeps until the next window otherwise, and pushes only changed
+status/score fields to matches.json and Firestore. Use --base-url to point
+it at a local server serving recorded round pages.
 """
 
 import json
 import re
 import os
+import time
+import hashlib
+import argparse
 from pathlib import Path
-from datetime import datetime
-import firebase_admin
-from firebase_admin import credentials, firestore
-from dotenv import load_dotenv
+from datetime import datetime, timedelta, timezone
+from firebase_client import get_db, server_timestamp
+from firestore_writes import write_in_batches
+from jsonl_records import logs_to_stderr, read_records, write_records
+from resultados_scraper import BASE_URL as RESULTADOS_BASE_URL
+from resultados_scraper import canonical_tournament, competition_for_tournament
+from resultados_scraper import round_url as competition_round_url
+from resultados_scraper.state import CHANGES_FILE, STATE_FILE, read_changes
 
 # Base directories
 BASE_DIR = Path(__file__).parent.parent
 MATCHES_FILE = BASE_DIR / "data" / "matches.json"
 RESULTADOS_DIR = BASE_DIR / "resultados"
+LEDGER_FILE = RESULTADOS_DIR / "_ledger.json"
+# Bumped when the stored row layout changes, so older ledgers are re-parsed
+LEDGER_VERSION = 3
+
+# A result found by teams alone (rescheduled game) must be this close to
+# the match date
+RESCHEDULE_WINDOW = timedelta(days=3)
+
+# Live mode (--live): polling cadence (round pages come from the
+# resultados_scraper competition registry)
+BRAZIL_TZ = timezone(timedelta(hours=-3))
+LIVE_WINDOW_BEFORE = timedelta(minutes=15)
+LIVE_WINDOW_AFTER = timedelta(minutes=150)
+LIVE_POLL_INTERVAL = 60  # seconds, while a match is in its window
+LIVE_IDLE_INTERVAL = 900  # seconds, max sleep while waiting for kickoff
 
 # Team name normalization mapping
 # Maps resultados team names to matches.json team names
@@ -80,48 +111,6 @@ TEAM_NAME_MAP = {
 }
 
 
-def initialize_firebase():
-    """Initialize Firebase Admin SDK using environment variables"""
-    env_path = BASE_DIR / '.env'
-    
-    if not env_path.exists():
-        print("WARNING: .env file not found for Firebase initialization")
-        return None
-    
-    load_dotenv(env_path)
-    
-    try:
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY", "")
-        if private_key:
-            private_key = private_key.replace('\\n', '\n')
-        
-        cred_dict = {
-            "type": os.getenv("FIREBASE_TYPE", "service_account"),
-            "project_id": os.getenv("FIREBASE_PROJECT_ID"),
-            "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-            "private_key": private_key,
-            "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-            "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-            "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
-            "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
-            "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-            "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        
-        if not cred_dict["project_id"] or not cred_dict["private_key"]:
-            print("WARNING: Missing required Firebase credentials")
-            return None
-        
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        return firestore.client()
-        
-    except Exception as e:
-        print(f"WARNING: Error initializing Firebase: {e}")
-        return None
-
-
 def normalize_team_name(name):
     """Normalize team name for matching."""
     # First check if there's a direct mapping
@@ -154,114 +143,413 @@ def save_matches(data):
         return False
 
 
+def finished_rows(matches):
+    """Yield compact rows for the finished matches of an iterable of match records.
+
+    Each row is [homeTeam, awayTeam, scoreHome, scoreAway, matchDate,
+    tournament] with the raw team slugs, so TEAM_NAME_MAP changes apply
+    without re-parsing.
+    """
+    for match in matches:
+        # Only consider finished matches
+        if match.get("status") == "finished":
+            score = match.get("score", {})
+            if score.get("home") is not None and score.get("away") is not None:
+                yield [
+                    match.get("homeTeam", ""),
+                    match.get("awayTeam", ""),
+                    score["home"],
+                    score["away"],
+                    match.get("matchDate"),
+                    match.get("tournament"),
+                ]
+
+
+def parse_resultados_file(data):
+    """Extract finished matches from one resultados file as compact rows."""
+    return list(finished_rows(data.get("matches", [])))
+
+
+def parse_state_file(data):
+    """Finished matches of current_resultados.json as {match id: row}."""
+    return {match.get("id"): row for match in data.get("matches", []) for row in finished_rows([match])}
+
+
+def result_from_row(row, source):
+    home, away, score_home, score_away, match_date, tournament = row
+    return {
+        # Files from the old per-competition scrapers use URL-derived ids
+        "tournament": canonical_tournament(tournament),
+        "homeTeam": normalize_team_name(home),
+        "awayTeam": normalize_team_name(away),
+        "score": {"home": score_home, "away": score_away},
+        "matchDate": match_date,
+        "source": source
+    }
+
+
+def load_result_records(source):
+    """Finished results from a stream of match records (JSONL file or '-')."""
+    name = "stdin" if source == "-" else Path(source).name
+    results = [result_from_row(row, name) for row in finished_rows(read_records(source))]
+    print(f"Loaded {len(results)} finished matches from {name}")
+    return results
+
+
+def load_ledger():
+    """Load the processed-files ledger ({file name: stat, hash and rows})."""
+    if not LEDGER_FILE.exists():
+        return {}
+    try:
+        with open(LEDGER_FILE, "r", encoding="utf-8") as f:
+            ledger = json.load(f)
+        if ledger.get("version") != LEDGER_VERSION:
+            print(f"{LEDGER_FILE.name} has an older row layout, re-parsing all resultados")
+            return {}
+        return ledger.get("files", {})
+    except Exception as e:
+        print(f"Could not read {LEDGER_FILE.name}, re-parsing all resultados: {e}")
+        return {}
+
+
+def save_ledger(files):
+    tmp_path = LEDGER_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": LEDGER_VERSION, "files": files}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, LEDGER_FILE)
+
+
+def load_change_log(entry):
+    """Bring the ledger entry for resultados/changes.jsonl up to date.
+
+    Rows are kept per match id (latest record wins) and only lines after
+    the stored offset are read. A log that was compacted (truncated or
+    rewritten, detected by its first line) is read again from the start;
+    the compacted matches arrive through current_resultados.json. Every id
+    the log mentions (including replaced previousIds) is kept in
+    replacedIds, so the log's rows supersede the state file's.
+    """
+    if not CHANGES_FILE.exists():
+        return None
+
+    with open(CHANGES_FILE, "rb") as f:
+        head = hashlib.sha256(f.readline()).hexdigest()
+    size = CHANGES_FILE.stat().st_size
+
+    if not entry or entry["head"] != head or entry["offset"] > size:
+        entry = {"path": str(CHANGES_FILE.relative_to(BASE_DIR)), "offset": 0, "head": head,
+                 "rowsById": {}, "replacedIds": []}
+    elif entry["offset"] == size:
+        return entry
+
+    rows_by_id = dict(entry["rowsById"])
+    replaced_ids = set(entry["replacedIds"])
+    offset = entry["offset"]
+    count = 0
+    for record, offset in read_changes(CHANGES_FILE, offset):
+        replaced_ids.add(record["id"])
+        if record.get("previousId"):
+            replaced_ids.add(record["previousId"])
+            rows_by_id.pop(record["previousId"], None)
+        rows = parse_resultados_file({"matches": [record["match"]]})
+        if rows:
+            rows_by_id[record["id"]] = rows[0]
+        else:
+            rows_by_id.pop(record["id"], None)
+        count += 1
+
+    print(f"Loaded {count} change records from {CHANGES_FILE.name}")
+    return {**entry, "offset": offset, "head": head, "rowsById": rows_by_id,
+            "replacedIds": sorted(replaced_ids)}
+
+
 def load_resultados():
-    """Load all resultados files and extract finished matches."""
+    """Load all resultados files and extract finished matches.
+
+    Files already in the ledger with the same size and mtime (or, failing
+    that, the same content hash) are not re-parsed; their stored rows are
+    reused. Files that disappeared drop out of the ledger. Rows from
+    changes.jsonl replace the current_resultados.json rows of the same
+    match id, so a corrected score is not a second candidate.
+    """
     finished_matches = []
 
     if not RESULTADOS_DIR.exists():
         print(f"Resultados directory not found: {RESULTADOS_DIR}")
         return finished_matches
 
-    for json_file in RESULTADOS_DIR.glob("*_resultados.json"):
+    previous = load_ledger()
+    ledger = {}
+    parsed = cached = 0
+
+    for json_file in sorted(RESULTADOS_DIR.glob("*_resultados.json")):
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            matches = data.get("matches", [])
-            for match in matches:
-                # Only consider finished matches
-                if match.get("status") == "finished":
-                    score = match.get("score", {})
-                    if score.get("home") is not None and score.get("away") is not None:
-                        finished_matches.append({
-                            "homeTeam": normalize_team_name(match.get("homeTeam", "")),
-                            "awayTeam": normalize_team_name(match.get("awayTeam", "")),
-                            "score": score,
-                            "matchDate": match.get("matchDate"),
-                            "source": json_file.name
-                        })
-
-            print(f"Loaded {len(matches)} matches from {json_file.name}")
+            stat = json_file.stat()
+            entry = previous.get(json_file.name)
+
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+                ledger[json_file.name] = entry
+                cached += 1
+                continue
+
+            content = json_file.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+
+            # The diff-mode state file is kept per match id
+            rows_key = "rowsById" if json_file.name == STATE_FILE.name else "rows"
+
+            if entry and entry["sha256"] == digest:
+                # Touched but unchanged
+                rows = entry[rows_key]
+                cached += 1
+            else:
+                data = json.loads(content.decode("utf-8"))
+                rows = parse_state_file(data) if rows_key == "rowsById" else parse_resultados_file(data)
+                parsed += 1
+                print(f"Loaded {len(data.get('matches', []))} matches from {json_file.name}")
+
+            ledger[json_file.name] = {
+                "path": str(json_file.relative_to(BASE_DIR)),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "sha256": digest,
+                rows_key: rows,
+            }
 
         except Exception as e:
             print(f"Error loading {json_file.name}: {e}")
 
+    # Diff-mode change log: only the lines appended since the last run are read
+    if CHANGES_FILE.exists() or CHANGES_FILE.name in previous:
+        entry = load_change_log(previous.get(CHANGES_FILE.name))
+        if entry:
+            ledger[CHANGES_FILE.name] = entry
+
+    removed = len(set(previous) - set(ledger))
+    print(f"Resultados files: {parsed} parsed, {cached} unchanged, {removed} removed")
+    if parsed or removed or ledger != previous:
+        save_ledger(ledger)
+
+    replaced_ids = set(ledger.get(CHANGES_FILE.name, {}).get("replacedIds", []))
+    for name, entry in ledger.items():
+        if name == STATE_FILE.name:
+            rows = [row for match_id, row in entry["rowsById"].items() if match_id not in replaced_ids]
+        elif "rowsById" in entry:
+            rows = entry["rowsById"].values()
+        else:
+            rows = entry["rows"]
+        for row in rows:
+            finished_matches.append(result_from_row(row, name))
+
     return finished_matches
 
 
-def find_matching_result(match, finished_results):
-    """Find a matching result for a given match."""
-    home_team = normalize_team_name(match.get("homeTeam", ""))
-    away_team = normalize_team_name(match.get("awayTeam", ""))
+def match_day(match_date):
+    """Calendar day (YYYY-MM-DD) of an ISO match date, or None."""
+    if not match_date:
+        return None
+    return str(match_date)[:10]
+
+
+def distinct_results(candidates):
+    """Collapse the same game scraped into several resultados files."""
+    unique = {}
+    for result in candidates:
+        key = (match_day(result.get("matchDate")), result["score"].get("home"), result["score"].get("away"))
+        unique.setdefault(key, result)
+    return list(unique.values())
+
+
+def build_results_index(finished_results):
+    """Index finished results by (tournament, home, away, day) with a
+    (tournament, home, away) fallback."""
+    by_date = {}
+    by_teams = {}
 
     for result in finished_results:
-        if result["homeTeam"] == home_team and result["awayTeam"] == away_team:
-            return result
+        teams_key = (result["tournament"], result["homeTeam"], result["awayTeam"])
+        by_teams.setdefault(teams_key, []).append(result)
+
+        day = match_day(result.get("matchDate"))
+        if day:
+            by_date.setdefault(teams_key + (day,), []).append(result)
 
+    return {
+        "by_date": {key: distinct_results(results) for key, results in by_date.items()},
+        "by_teams": {key: distinct_results(results) for key, results in by_teams.items()},
+    }
+
+
+def within_reschedule_window(result_date, day):
+    """True for a result without a (valid) date or dated near day."""
+    try:
+        result_day = datetime.fromisoformat(match_day(result_date))
+    except (TypeError, ValueError):
+        return True
+    return abs(result_day - datetime.fromisoformat(day)) <= RESCHEDULE_WINDOW
+
+
+def find_matching_result(match, results_index, conflicts=None):
+    """Find a matching result for a given match.
+
+    Looks up (tournament, home, away, day) first. The (tournament, home,
+    away) fallback covers rescheduled games and results without a date, but
+    only results without a date or within RESCHEDULE_WINDOW of the match
+    date, and only when every candidate is the same game. Ambiguous lookups
+    are appended to conflicts (if given) and return None.
+    """
+    teams_key = (
+        match.get("tournament"),
+        normalize_team_name(match.get("homeTeam", "")),
+        normalize_team_name(match.get("awayTeam", "")),
+    )
+    day = match_day(match.get("matchDate"))
+
+    candidates = results_index["by_date"].get(teams_key + (day,)) if day else None
+    if not candidates:
+        candidates = results_index["by_teams"].get(teams_key, [])
+        if day:
+            candidates = [c for c in candidates if within_reschedule_window(c.get("matchDate"), day)]
+
+    if len(candidates) == 1:
+        return candidates[0]
+
+    if candidates and conflicts is not None:
+        conflicts.append((match, candidates))
     return None
 
 
-def update_scores():
-    """Main function to update null scores in matches.json."""
+def kicked_off(match, now):
+    """False only for a match whose kickoff is known and still ahead of now."""
+    kickoff = parse_kickoff(match)
+    if kickoff is None:
+        return True
+    if kickoff.tzinfo is None:
+        kickoff = kickoff.replace(tzinfo=BRAZIL_TZ)
+    return kickoff <= now
+
+
+def apply_result(match, results_index, conflicts, db, firestore_writes, now):
+    """Fill a null score from the matching result; returns True if updated."""
+    score = match.get("score", {})
+
+    # Check if score is null
+    if score.get("home") is not None and score.get("away") is not None:
+        return False
+
+    # A game that has not started yet cannot have a result
+    if not kicked_off(match, now):
+        return False
+
+    # Try to find matching result
+    result = find_matching_result(match, results_index, conflicts)
+    if not result:
+        return False
+
+    # Update the score
+    match["score"] = result["score"]
+    match["status"] = "finished"
+
+    match_id = match.get("id")
+    print(f"Updated: {match.get('homeTeam')} vs {match.get('awayTeam')} -> {result['score']['home']}-{result['score']['away']}")
+
+    # Queue the Firestore update; committed in batches later
+    if db and match_id:
+        firestore_writes.append(("update", db.collection('matches').document(match_id), {
+            "score": result["score"],
+            "status": "finished",
+            "updatedAt": server_timestamp()
+        }))
+    return True
+
+
+def update_scores(results_source=None, matches_in=None, matches_out=None):
+    """Main function to update null scores in matches.json.
+
+    results_source reads finished results from a stream of match records
+    instead of the resultados directory. With matches_in, matches are
+    streamed record by record from that JSONL source to matches_out
+    (default: back to matches_in, or stdout when reading stdin) instead of
+    loading and rewriting matches.json. The output is always JSONL, so a
+    .json document can be read but needs a separate matches_out.
+    """
+    if matches_in:
+        matches_out = matches_out or matches_in
+        if matches_out != "-" and Path(matches_out).suffix == ".json":
+            raise ValueError(f"matches are written as JSONL, not to the .json document {matches_out}")
+
     print("=" * 60)
     print(f"Score Update Job - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     print()
 
     # Load matches
-    matches_data = load_matches()
-    if not matches_data:
-        print("Failed to load matches.json")
-        return
+    matches_data = None
+    if not matches_in:
+        matches_data = load_matches()
+        if not matches_data:
+            print("Failed to load matches.json")
+            return
 
     # Load finished results from resultados
-    finished_results = load_resultados()
+    if results_source:
+        finished_results = load_result_records(results_source)
+    else:
+        finished_results = load_resultados()
     print(f"\nFound {len(finished_results)} finished matches in resultados")
     print()
+    results_index = build_results_index(finished_results)
+    conflicts = []
+    now = datetime.now(timezone.utc)
 
     # Find matches with null scores
-    matches_list = matches_data.get("matches", [])
     updated_count = 0
     firestore_updated_count = 0
+    firestore_writes = []
 
     # Initialize Firestore
-    db = initialize_firebase()
+    db = get_db()
     if db:
         print("Connected to Firestore")
     else:
         print("Proceeding with local updates only")
 
-    for match in matches_list:
-        score = match.get("score", {})
-
-        # Check if score is null
-        if score.get("home") is None or score.get("away") is None:
-            # Try to find matching result
-            result = find_matching_result(match, finished_results)
+    if matches_in:
+        def updated_records():
+            nonlocal updated_count
+            for match in read_records(matches_in):
+                if apply_result(match, results_index, conflicts, db, firestore_writes, now):
+                    updated_count += 1
+                yield match
 
-            if result:
-                # Update the score
-                match["score"] = result["score"]
-                match["status"] = "finished"
+        written = write_records(updated_records(), matches_out)
+        print(f"\nStreamed {written} matches to {'stdout' if matches_out == '-' else matches_out}")
+    else:
+        for match in matches_data.get("matches", []):
+            if apply_result(match, results_index, conflicts, db, firestore_writes, now):
                 updated_count += 1
-                
-                match_id = match.get("id")
-                print(f"Updated: {match.get('homeTeam')} vs {match.get('awayTeam')} -> {result['score']['home']}-{result['score']['away']}")
-                
-                # Update Firestore if available
-                if db and match_id:
-                    try:
-                        db.collection('matches').document(match_id).update({
-                            "score": result["score"],
-                            "status": "finished",
-                            "updatedAt": firestore.SERVER_TIMESTAMP
-                        })
-                        firestore_updated_count += 1
-                    except Exception as e:
-                        print(f"Error updating Firestore for match {match_id}: {e}")
+
+    if firestore_writes:
+        firestore_updated_count, failed_writes = write_in_batches(db, firestore_writes)
+        print(f"\nFirestore: {firestore_updated_count} committed, {len(failed_writes)} failed")
+        for match_id, error in failed_writes:
+            print(f"Error updating Firestore for match {match_id}: {error}")
+
+    if conflicts:
+        print(f"\nSkipped {len(conflicts)} matches with conflicting results:")
+        for match, candidates in conflicts:
+            options = ", ".join(
+                f"{c['score']['home']}-{c['score']['away']} on {c.get('matchDate') or 'unknown date'} ({c['source']})"
+                for c in candidates
+            )
+            print(f"  {match.get('id')}: {options}")
 
     # Save if there were updates
-    if updated_count > 0:
+    if matches_in:
+        print(f"\n{updated_count} score updates")
+        if db:
+            print(f"Synced {firestore_updated_count}/{updated_count} updates to Firestore")
+    elif updated_count > 0:
         if save_matches(matches_data):
             print(f"\nSaved {updated_count} score updates to matches.json")
             if db:
@@ -277,9 +565,189 @@ def update_scores():
     print("=" * 60)
 
 
+def parse_kickoff(match):
+    """Kickoff as an aware datetime, or None."""
+    try:
+        return datetime.fromisoformat(str(match.get("matchDate")).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def live_targets(matches_list, now):
+    """Today's scheduled/live matches that have not run past their window."""
+    today = now.astimezone(BRAZIL_TZ).date()
+    targets = []
+    for match in matches_list:
+        if match.get("status") not in ("scheduled", "live"):
+            continue
+        kickoff = parse_kickoff(match)
+        if not kickoff or kickoff.tzinfo is None or kickoff.astimezone(BRAZIL_TZ).date() != today:
+            continue
+        if now > kickoff + LIVE_WINDOW_AFTER:
+            continue
+        targets.append(match)
+    return targets
+
+
+def in_live_window(match, now):
+    kickoff = parse_kickoff(match)
+    return kickoff - LIVE_WINDOW_BEFORE <= now <= kickoff + LIVE_WINDOW_AFTER
+
+
+def next_poll_delay(targets, now):
+    """Seconds until the next poll, or None when nothing is left today."""
+    if any(in_live_window(match, now) for match in targets):
+        return LIVE_POLL_INTERVAL
+    upcoming = [parse_kickoff(match) - LIVE_WINDOW_BEFORE for match in targets]
+    upcoming = [start for start in upcoming if start > now]
+    if not upcoming:
+        return None
+    return min(LIVE_IDLE_INTERVAL, (min(upcoming) - now).total_seconds())
+
+
+def round_url(match, base_url):
+    """resultados-futbol.com round page for a match, or None if unknown."""
+    competition = competition_for_tournament(match.get("tournament"))
+    round_match = re.search(r"\d+", str(match.get("round", "")))
+    if not competition or not round_match:
+        return None
+    return competition_round_url(competition, int(round_match.group(0)), base_url)
+
+
+def poll_round(url):
+    """Fetch one round page and return the scraper's parsed matches."""
+    # Imported here so the daily job does not need the scraper dependencies
+    from resultados_scraper.engine import fetch_and_parse
+
+    return fetch_and_parse(url).get("matches", [])
+
+
+def live_changes(match, result):
+    """Status/score fields that differ between a match and a polled result."""
+    changes = {}
+    if result["status"] != match.get("status"):
+        changes["status"] = result["status"]
+    if result["score"].get("home") is not None and result["score"] != match.get("score"):
+        changes["score"] = result["score"]
+    return changes
+
+
+def poll_live_once(matches_data, db, base_url, now):
+    """Poll the round pages of in-window matches and push what changed.
+
+    Returns the remaining targets for today.
+    """
+    matches_list = matches_data.get("matches", [])
+    targets = live_targets(matches_list, now)
+    active = [match for match in targets if in_live_window(match, now)]
+
+    urls = {}
+    for match in active:
+        url = round_url(match, base_url)
+        if url:
+            urls.setdefault(url, []).append(match)
+        else:
+            print(f"No round page known for {match.get('id')}")
+
+    updates = []
+    for url, round_matches in urls.items():
+        try:
+            polled = poll_round(url)
+        except Exception as e:
+            print(f"Error polling {url}: {e}")
+            continue
+
+        # Every match polled from one round page is of the same tournament
+        tournament = round_matches[0].get("tournament")
+        results_index = build_results_index([{
+            "tournament": tournament,
+            "homeTeam": normalize_team_name(p.get("homeTeam", "")),
+            "awayTeam": normalize_team_name(p.get("awayTeam", "")),
+            "score": p.get("score", {}),
+            "status": p.get("status"),
+            "matchDate": p.get("matchDate"),
+            "source": url,
+        } for p in polled])
+
+        for match in round_matches:
+            result = find_matching_result(match, results_index)
+            if not result:
+                continue
+            changes = live_changes(match, result)
+            if changes:
+                match.update(changes)
+                updates.append((match, changes))
+                score = match.get("score", {})
+                print(f"{now.astimezone(BRAZIL_TZ):%H:%M} {match.get('id')}: "
+                      f"{match.get('status')} {score.get('home')}-{score.get('away')}")
+
+    if updates:
+        save_matches(matches_data)
+        if db:
+            writes = [("update", db.collection('matches').document(match["id"]),
+                       dict(changes, updatedAt=server_timestamp()))
+                      for match, changes in updates if match.get("id")]
+            committed, failed = write_in_batches(db, writes)
+            print(f"Firestore: {committed} committed, {len(failed)} failed")
+
+    return live_targets(matches_list, now)
+
+
+def run_live(base_url=RESULTADOS_BASE_URL, once=False):
+    """Poll today's matches until they are all finished or past their window."""
+    print("=" * 60)
+    print(f"Live Score Polling - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
+
+    matches_data = load_matches()
+    if not matches_data:
+        print("Failed to load matches.json")
+        return
+
+    db = get_db()
+    if not db:
+        print("Proceeding with local updates only")
+
+    while True:
+        now = datetime.now(timezone.utc)
+        targets = poll_live_once(matches_data, db, base_url, now)
+        delay = next_poll_delay(targets, now)
+        if once or delay is None:
+            break
+        time.sleep(delay)
+
+    print("No more matches to follow today")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update match scores from resultados")
+    parser.add_argument("--live", action="store_true",
+                        help="Keep polling today's round pages and push status/score changes")
+    parser.add_argument("--once", action="store_true", help="With --live, poll a single time and exit")
+    parser.add_argument("--base-url", default=RESULTADOS_BASE_URL,
+                        help="resultados-futbol.com base URL (point at a local server for tests)")
+    parser.add_argument("--results", metavar="SOURCE",
+                        help="Read finished results from match records (JSONL file or '-' for stdin)")
+    parser.add_argument("--matches-in", metavar="SOURCE",
+                        help="Stream matches from a JSONL file or '-' instead of matches.json")
+    parser.add_argument("--matches-out", metavar="DEST",
+                        help="With --matches-in, write matches here as JSONL ('-' for stdout; "
+                             "required when --matches-in is a .json document)")
+    args = parser.parse_args()
+    if args.results == "-" and args.matches_in == "-":
+        parser.error("--results and --matches-in cannot both read stdin")
+    if args.matches_in == "-" and not args.matches_out:
+        args.matches_out = "-"
+    if args.matches_in and Path(args.matches_out or args.matches_in).suffix == ".json":
+        parser.error("--matches-in writes JSONL: give a .jsonl or '-' --matches-out "
+                     "instead of writing over a .json document")
+
     try:
-        update_scores()
+        if args.live:
+            run_live(base_url=args.base_url, once=args.once)
+        else:
+            with logs_to_stderr(args.matches_out):
+                update_scores(args.results, args.matches_in, args.matches_out)
     except KeyboardInterrupt:
         print("\n\nUpdate interrupted by user")
     except Exception as e:
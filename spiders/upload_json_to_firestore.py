@@ -6,71 +6,36 @@ This script loads JSON files from /data/ and uploads them to Firestore
 
 import json
 import os
+import argparse
+import hashlib
 from pathlib import Path
-import firebase_admin
-from firebase_admin import credentials, firestore
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
+from firebase_client import get_db, server_timestamp
+from jsonl_records import read_records
+from firestore_snapshot import FirestoreJSONEncoder
+from firestore_writes import write_in_batches
 
-# Initialize Firebase Admin SDK
-def initialize_firebase():
-    """Initialize Firebase Admin SDK using environment variables"""
-    
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent / '.env'
-    
-    if not env_path.exists():
-        print("ERROR: .env file not found!")
-        print("Expected location: " + str(env_path))
-        return None
-    
-    # Load the .env file
-    load_dotenv(env_path)
-    
-    # Get credentials from environment variables
-    try:
-        # Build credentials dictionary from environment variables
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY", "")
-        # Fix newlines in private key
-        private_key = private_key.replace('\\n', '\n')
-        
-        cred_dict = {
-            "type": os.getenv("FIREBASE_TYPE", "service_account"),
-            "project_id": os.getenv("FIREBASE_PROJECT_ID"),
-            "private_key_id": os.getenv("FIREBASE_PRIVATE_KEY_ID"),
-            "private_key": private_key,
-            "client_email": os.getenv("FIREBASE_CLIENT_EMAIL"),
-            "client_id": os.getenv("FIREBASE_CLIENT_ID"),
-            "auth_uri": os.getenv("FIREBASE_AUTH_URI"),
-            "token_uri": os.getenv("FIREBASE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("FIREBASE_AUTH_PROVIDER_CERT_URL"),
-            "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_CERT_URL"),
-            "universe_domain": os.getenv("FIREBASE_UNIVERSE_DOMAIN", "googleapis.com")
-        }
-        
-        # Verify required fields are present
-        if not cred_dict["project_id"] or not cred_dict["private_key"]:
-            print("ERROR: Missing required Firebase credentials in .env file!")
-            print("Required: FIREBASE_PROJECT_ID, FIREBASE_PRIVATE_KEY")
-            return None
-        
-        # Initialize Firebase with credentials dictionary
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        db = firestore.client()
-        print("SUCCESS: Firebase Admin SDK initialized")
-        print("Project: " + cred_dict['project_id'])
-        return db
-        
-    except Exception as e:
-        print("ERROR initializing Firebase: " + str(e))
-        print("\nMake sure your .env file contains all required Firebase credentials:")
-        print("   - FIREBASE_PROJECT_ID")
-        print("   - FIREBASE_PRIVATE_KEY")
-        print("   - FIREBASE_CLIENT_EMAIL")
-        return None
+BASE_DIR = Path(__file__).parent.parent
+
+# Content hashes of what was last uploaded, per project and collection (--sync)
+UPLOAD_MANIFEST_FILE = BASE_DIR / 'firestore_upload_manifest.json'
+
+# Batches committed in parallel per collection
+DEFAULT_WORKERS = 4
+
+# Upload metadata, left out of content hashes
+METADATA_FIELDS = ('uploadedAt', 'updatedAt')
 
+# (data file, top-level key, Firestore collection), in upload order
+UPLOADS = [
+    ('teams.json', 'teams', 'teams'),
+    ('tournaments.json', 'tournaments', 'leagues'),
+    ('canais.json', 'canais', 'canais'),
+    ('matches.json', 'matches', 'matches'),
+]
 
+# Initialize Firebase Admin SDK
 def load_json_file(file_path):
     """Load and parse a JSON file"""
     try:
@@ -83,51 +48,223 @@ def load_json_file(file_path):
         return None
 
 
-def upload_collection(db, collection_name, items, id_field='id'):
-    """Upload items to a Firestore collection"""
+def upload_collection(db, collection_name, items, id_field='id', workers=DEFAULT_WORKERS):
+    """Upload items (a list or any iterable, e.g. streamed records) to a Firestore collection.
+
+    Documents are written in batches of up to 500, with up to `workers`
+    batches in flight; failed batches are retried with backoff and then
+    per document, and the documents that still fail are reported.
+    """
     
-    if not items:
+    if isinstance(items, list) and not items:
         print("WARNING: No items to upload for " + collection_name)
         return 0
     
     print("\nUploading to collection: " + collection_name)
-    print("Items to upload: " + str(len(items)))
+    if isinstance(items, list):
+        print("Items to upload: " + str(len(items)))
     
-    uploaded = 0
-    errors = 0
+    skipped = 0
     
-    for item in items:
-        try:
+    def writes():
+        nonlocal skipped
+        for item in items:
             # Use the item's ID field as document ID
             doc_id = item.get(id_field)
             
             if not doc_id:
                 print("WARNING: Skipping item without " + id_field)
-                errors += 1
+                skipped += 1
                 continue
             
             # Add metadata
-            item['uploadedAt'] = firestore.SERVER_TIMESTAMP
-            
-            # Upload to Firestore
-            db.collection(collection_name).document(doc_id).set(item)
-            uploaded += 1
-            
-            if uploaded % 10 == 0:
-                print("   Uploaded " + str(uploaded) + "/" + str(len(items)) + "...")
-                
-        except Exception as e:
-            print("ERROR uploading item " + item.get(id_field, 'unknown') + ": " + str(e))
-            errors += 1
+            data = dict(item)
+            data['uploadedAt'] = server_timestamp()
+            yield ('set', db.collection(collection_name).document(doc_id), data)
+    
+    uploaded, failed = write_in_batches(db, writes(), workers=workers)
+    
+    for doc_id, error in failed:
+        print("ERROR uploading item " + doc_id + " to " + collection_name + ": " + error)
     
     print("SUCCESS: Uploaded " + str(uploaded) + " items to " + collection_name)
-    if errors > 0:
-        print("WARNING: " + str(errors) + " errors occurred")
+    if failed or skipped:
+        print("WARNING: " + str(len(failed) + skipped) + " errors occurred in " + collection_name)
     
     return uploaded
 
 
-def main():
+def upload_file(db, path, key, collection_name, workers=DEFAULT_WORKERS):
+    """Load one data file and upload its items; returns (collection, count)"""
+    data = load_json_file(path)
+    if not data or key not in data:
+        return collection_name, 0
+    return collection_name, upload_collection(db, collection_name, data[key], id_field='id', workers=workers)
+
+
+def content_hash(item):
+    """SHA-256 of the item's canonical JSON, ignoring upload metadata"""
+    content = {key: value for key, value in item.items() if key not in METADATA_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+                           cls=FirestoreJSONEncoder)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_upload_manifest(project_id):
+    """{collection: {doc_id: hash}} last uploaded to this project, or {}"""
+    if not UPLOAD_MANIFEST_FILE.exists():
+        return {}
+    try:
+        with open(UPLOAD_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print("WARNING: Could not read upload manifest, treating everything as new: " + str(e))
+        return {}
+    if manifest.get('projectId') != project_id:
+        return {}
+    return manifest.get('collections', {})
+
+
+def save_upload_manifest(project_id, collections):
+    tmp_path = UPLOAD_MANIFEST_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'projectId': project_id, 'collections': collections}, f, separators=(',', ':'))
+    os.replace(tmp_path, UPLOAD_MANIFEST_FILE)
+
+
+def remote_documents(db, collection_name):
+    """Every document currently in the collection, fetched in one bulk read"""
+    return {doc.id: doc.to_dict() for doc in db.collection(collection_name).stream()}
+
+
+def sync_collection(db, collection_name, items, known_hashes=None, remote_docs=None,
+                    id_field='id', delete=False, dry_run=False, workers=DEFAULT_WORKERS):
+    """Write only the items whose content differs from what was uploaded before.
+
+    The comparison is against known_hashes ({doc_id: hash} from the upload
+    manifest) or, when given, remote_docs ({doc_id: data} from Firestore,
+    compared on the item's own fields so fields added remotely, like
+    matchURL, do not count as changes). With delete, documents known
+    before but no longer in items are deleted.
+    Returns (stats, hashes) with hashes the new {doc_id: hash} manifest
+    entry for the collection (failed writes keep their old hash).
+    """
+    known_hashes = known_hashes or {}
+    known_ids = set(remote_docs) if remote_docs is not None else set(known_hashes)
+    stats = {'inserted': [], 'changed': [], 'unchanged': 0, 'deleted': [], 'failed': []}
+    hashes = {}
+    writes = []
+
+    for item in items:
+        doc_id = item.get(id_field)
+        if not doc_id:
+            print("WARNING: Skipping item without " + id_field)
+            continue
+
+        item_hash = content_hash(item)
+        hashes[doc_id] = item_hash
+        if remote_docs is not None and doc_id in remote_docs:
+            remote = {**remote_docs[doc_id], id_field: doc_id}
+            known_hash = content_hash({key: remote[key] for key in item if key in remote})
+        else:
+            known_hash = known_hashes.get(doc_id)
+        if known_hash == item_hash:
+            stats['unchanged'] += 1
+            continue
+
+        stats['changed' if doc_id in known_ids else 'inserted'].append(doc_id)
+        if not dry_run:
+            data = dict(item)
+            data['uploadedAt'] = server_timestamp()
+            writes.append(('set', db.collection(collection_name).document(doc_id), data))
+
+    removed = known_ids - set(hashes)
+    if delete:
+        stats['deleted'] = sorted(removed)
+        if not dry_run:
+            for doc_id in stats['deleted']:
+                writes.append(('delete', db.collection(collection_name).document(doc_id), None))
+    else:
+        # Left in place remotely, so still part of the manifest
+        for doc_id in removed:
+            if doc_id in known_hashes:
+                hashes[doc_id] = known_hashes[doc_id]
+
+    if writes:
+        _, failed = write_in_batches(db, writes, workers=workers)
+        stats['failed'] = failed
+        for doc_id, _ in failed:
+            if doc_id in known_hashes:
+                hashes[doc_id] = known_hashes[doc_id]
+            else:
+                hashes.pop(doc_id, None)
+
+    return stats, hashes
+
+
+def print_sync_report(collection_name, stats, dry_run=False, verbose_limit=10):
+    prefix = "[DRY RUN] Would write" if dry_run else "Wrote"
+    writes = len(stats['inserted']) + len(stats['changed']) + len(stats['deleted'])
+    print(f"{collection_name}: {prefix} {writes} documents "
+          f"({len(stats['inserted'])} new, {len(stats['changed'])} changed, {len(stats['deleted'])} deleted), "
+          f"{stats['unchanged']} unchanged")
+    for label in ('inserted', 'changed', 'deleted'):
+        ids = stats[label]
+        if ids:
+            shown = ", ".join(ids[:verbose_limit])
+            more = f" (+{len(ids) - verbose_limit} more)" if len(ids) > verbose_limit else ""
+            print(f"   {label}: {shown}{more}")
+    for doc_id, error in stats['failed']:
+        print(f"   ERROR writing {doc_id}: {error}")
+
+
+def sync_all(remote=False, delete=False, dry_run=False, jsonl=None, collection=None, id_field='id',
+             workers=DEFAULT_WORKERS):
+    """Upload only new/changed documents (see sync_collection) for data/ or a JSONL stream.
+
+    delete only applies to the data/ files: a JSONL stream (e.g. the
+    scraper's diff output) may hold only part of a collection.
+    """
+    if delete and jsonl:
+        raise ValueError("delete is only supported for the data/ files, not for a JSONL stream")
+
+    db = get_db()
+    if not db:
+        print("\nERROR: Failed to initialize Firebase. Exiting.")
+        return
+
+    project_id = db.project
+    manifest = load_upload_manifest(project_id)
+    data_dir = BASE_DIR / 'data'
+
+    if jsonl:
+        sources = [(collection, lambda: read_records(jsonl))]
+    else:
+        sources = []
+        for filename, key, collection_name in UPLOADS:
+            path = data_dir / filename
+            if path.exists():
+                sources.append((collection_name, lambda path=path, key=key: read_records(path, key)))
+
+    total_writes = 0
+    for collection_name, load_items in sources:
+        remote_docs = None
+        if remote:
+            remote_docs = remote_documents(db, collection_name)
+            print(f"\n{collection_name}: fetched {len(remote_docs)} remote documents")
+        stats, hashes = sync_collection(db, collection_name, load_items(), manifest.get(collection_name, {}),
+                                        remote_docs, id_field=id_field, delete=delete, dry_run=dry_run,
+                                        workers=workers)
+        print_sync_report(collection_name, stats, dry_run)
+        total_writes += len(stats['inserted']) + len(stats['changed']) + len(stats['deleted'])
+        manifest[collection_name] = hashes
+
+    if not dry_run:
+        save_upload_manifest(project_id, manifest)
+    print(f"\nDone! {total_writes} document writes{' (dry run, nothing written)' if dry_run else ''}")
+
+
+def main(workers=DEFAULT_WORKERS):
     """Main function to upload all JSON data to Firestore"""
     
     print("=" * 60)
@@ -136,13 +273,13 @@ def main():
     print()
     
     # Initialize Firebase
-    db = initialize_firebase()
+    db = get_db()
     if not db:
         print("\nERROR: Failed to initialize Firebase. Exiting.")
         return
     
     # Define data directory
-    data_dir = Path(__file__).parent.parent / 'data'
+    data_dir = BASE_DIR / 'data'
     
     if not data_dir.exists():
         print("ERROR: Data directory not found: " + str(data_dir))
@@ -157,41 +294,16 @@ def main():
         'collections': []
     }
     
-    # Upload Teams
-    teams_file = data_dir / 'teams.json'
-    if teams_file.exists():
-        data = load_json_file(teams_file)
-        if data and 'teams' in data:
-            count = upload_collection(db, 'teams', data['teams'], id_field='id')
-            stats['total_uploaded'] += count
-            stats['collections'].append(('teams', count))
-    
-    # Upload Tournaments (Leagues)
-    tournaments_file = data_dir / 'tournaments.json'
-    if tournaments_file.exists():
-        data = load_json_file(tournaments_file)
-        if data and 'tournaments' in data:
-            count = upload_collection(db, 'leagues', data['tournaments'], id_field='id')
-            stats['total_uploaded'] += count
-            stats['collections'].append(('leagues', count))
-    
-    # Upload Channels (Canais)
-    canais_file = data_dir / 'canais.json'
-    if canais_file.exists():
-        data = load_json_file(canais_file)
-        if data and 'canais' in data:
-            count = upload_collection(db, 'canais', data['canais'], id_field='id')
+    # The collections are independent: upload them concurrently
+    uploads = [(data_dir / filename, key, collection_name)
+               for filename, key, collection_name in UPLOADS if (data_dir / filename).exists()]
+    with ThreadPoolExecutor(max_workers=max(1, len(uploads))) as executor:
+        futures = [executor.submit(upload_file, db, path, key, collection_name, workers)
+                   for path, key, collection_name in uploads]
+        for future in futures:
+            collection_name, count = future.result()
             stats['total_uploaded'] += count
-            stats['collections'].append(('canais', count))
-    
-    # Upload Matches
-    matches_file = data_dir / 'matches.json'
-    if matches_file.exists():
-        data = load_json_file(matches_file)
-        if data and 'matches' in data:
-            count = upload_collection(db, 'matches', data['matches'], id_field='id')
-            stats['total_uploaded'] += count
-            stats['collections'].append(('matches', count))
+            stats['collections'].append((collection_name, count))
     
     # Print summary
     print("\n" + "=" * 60)
@@ -214,5 +326,39 @@ def main():
     print("\nDone!")
 
 
+def upload_stream(source, collection_name, id_field='id', workers=DEFAULT_WORKERS):
+    """Upload match records streamed from a JSONL file or stdin ('-')"""
+    db = get_db()
+    if not db:
+        print("\nERROR: Failed to initialize Firebase. Exiting.")
+        return
+    count = upload_collection(db, collection_name, read_records(source), id_field=id_field, workers=workers)
+    print("\nDone! " + str(count) + " items uploaded to " + collection_name)
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Upload JSON data to Firestore")
+    parser.add_argument('--jsonl', metavar='SOURCE',
+                        help="Upload records from a JSONL file or '-' (stdin) instead of data/*.json")
+    parser.add_argument('--collection', default='matches', help="Target collection for --jsonl (default: matches)")
+    parser.add_argument('--id-field', default='id', help="Record field used as document id (default: id)")
+    parser.add_argument('--sync', action='store_true',
+                        help="Only write documents whose content changed since the last upload (upload manifest)")
+    parser.add_argument('--remote', action='store_true',
+                        help="With --sync, compare against the documents in Firestore instead of the manifest")
+    parser.add_argument('--delete', action='store_true',
+                        help="With --sync, delete documents that are no longer in data/*.json "
+                             "(not with --jsonl: a stream may hold only part of a collection)")
+    parser.add_argument('--dry-run', action='store_true', help="With --sync, report what would be written")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Write batches committed in parallel per collection (default: {DEFAULT_WORKERS})")
+    args = parser.parse_args()
+    if args.delete and args.jsonl:
+        parser.error("--delete cannot be used with --jsonl: a stream may hold only part of the collection")
+
+    if args.sync or args.remote or args.delete or args.dry_run:
+        sync_all(args.remote, args.delete, args.dry_run, args.jsonl, args.collection, args.id_field, args.workers)
+    elif args.jsonl:
+        upload_stream(args.jsonl, args.collection, args.id_field, args.workers)
+    else:
+        main(args.workers)